@@ -0,0 +1,517 @@
+"""
+Numba kernels for the window-based indicators and cross events.
+
+The loops reproduce pandas' own algorithms step for step (Kahan-compensated
+rolling sums and Welford variance, the adjust=False EWM recursion, infinities
+treated as missing like NaN), so results match
+``indicators.sma/ema/rsi/macd/bbands`` bit for bit.
+
+``specialized_kernel(name, window)`` returns a kernel for one fixed window. The
+window is captured as a closure constant, which Numba freezes into the compiled
+code, so each (indicator, window) pair gets its own machine code. Kernels are
+cached per process, so a strategy replayed over many frames compiles once.
+
+``eval_tape`` interprets a whole strategy expression encoded as flat
+instruction arrays, so evaluation runs in native code end to end.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+# Import with fallback for script execution
+try:
+    from ._njit import njit, prange
+except ImportError:  # script mode
+    from _njit import njit, prange  # type: ignore
+
+
+@njit
+def _rolling_mean(values, window):
+    """pandas ``rolling(window, min_periods=window).mean()`` over a float64 array."""
+    n = len(values)
+    out = np.empty(n, dtype=np.float64)
+    nobs = 0
+    neg_ct = 0
+    sum_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same_ct = 0
+    prev_value = np.nan
+
+    for i in range(n):
+        start = i + 1 - window
+        if start < 0:
+            start = 0
+        if i == 0 or start >= i:
+            # Fresh window (always the case for window == 1)
+            nobs = 0
+            neg_ct = 0
+            sum_x = 0.0
+            comp_add = 0.0
+            comp_remove = 0.0
+            same_ct = 0
+            prev_value = values[start]
+            first = start
+        else:
+            # Drop the value that slid out, then add the new one
+            first = i
+            if start > 0:
+                val = values[start - 1]
+                if np.isfinite(val):
+                    nobs -= 1
+                    y = -val - comp_remove
+                    t = sum_x + y
+                    comp_remove = t - sum_x - y
+                    sum_x = t
+                    if np.signbit(val):
+                        neg_ct -= 1
+
+        for j in range(first, i + 1):
+            val = values[j]
+            if np.isfinite(val):
+                nobs += 1
+                y = val - comp_add
+                t = sum_x + y
+                comp_add = t - sum_x - y
+                sum_x = t
+                if np.signbit(val):
+                    neg_ct += 1
+                if val == prev_value:
+                    same_ct += 1
+                else:
+                    same_ct = 1
+                prev_value = val
+
+        if nobs >= window and nobs > 0:
+            result = sum_x / nobs
+            if same_ct >= nobs:
+                result = prev_value
+            elif neg_ct == 0 and result < 0:
+                result = 0.0
+            elif neg_ct == nobs and result > 0:
+                result = 0.0
+            out[i] = result
+        else:
+            out[i] = np.nan
+    return out
+
+
+# Relative drop in the sum of squared deviations that pandas treats as
+# catastrophic cancellation, forcing a recompute of the window
+_INV_COND_TOL = np.finfo(np.float64).eps * 1e3
+
+
+@njit
+def _add_var(val, nobs, mean_x, ssqdm_x, comp, unstable):
+    """Welford update with Kahan compensation, as in pandas ``add_var``."""
+    if not np.isfinite(val):
+        return nobs, mean_x, ssqdm_x, comp, unstable
+    prev_m2 = ssqdm_x
+    nobs += 1.0
+    prev_mean = mean_x - comp
+    y = val - comp
+    t = y - mean_x
+    comp = t + mean_x - y
+    mean_x = mean_x + t / nobs
+    ssqdm_x = ssqdm_x + (val - prev_mean) * (val - mean_x)
+    if prev_m2 * _INV_COND_TOL > ssqdm_x:
+        unstable = True
+    return nobs, mean_x, ssqdm_x, comp, unstable
+
+
+@njit
+def _remove_var(val, nobs, mean_x, ssqdm_x, comp, unstable):
+    """Inverse of ``_add_var``, as in pandas ``remove_var``."""
+    if not np.isfinite(val):
+        return nobs, mean_x, ssqdm_x, comp, unstable
+    prev_m2 = ssqdm_x
+    nobs -= 1.0
+    if nobs:
+        prev_mean = mean_x - comp
+        y = val - comp
+        t = y - mean_x
+        comp = t + mean_x - y
+        mean_x = mean_x - t / nobs
+        ssqdm_x = ssqdm_x - (val - prev_mean) * (val - mean_x)
+        if prev_m2 * _INV_COND_TOL > ssqdm_x:
+            unstable = True
+    else:
+        mean_x = 0.0
+        ssqdm_x = 0.0
+        unstable = False
+    return nobs, mean_x, ssqdm_x, comp, unstable
+
+
+@njit
+def _rolling_std(values, window):
+    """pandas ``rolling(window, min_periods=window).std(ddof=0)`` over a float64 array."""
+    n = len(values)
+    out = np.empty(n, dtype=np.float64)
+    nobs = 0.0
+    mean_x = 0.0
+    ssqdm_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    unstable = False
+
+    for i in range(n):
+        start = i + 1 - window
+        if start < 0:
+            start = 0
+        recompute = i == 0 or start >= i
+        if not recompute:
+            if start > 0:
+                nobs, mean_x, ssqdm_x, comp_remove, unstable = _remove_var(
+                    values[start - 1], nobs, mean_x, ssqdm_x, comp_remove, unstable
+                )
+            nobs, mean_x, ssqdm_x, comp_add, unstable = _add_var(
+                values[i], nobs, mean_x, ssqdm_x, comp_add, unstable
+            )
+        if recompute or unstable:
+            # Fresh window, or cancellation made the running state unreliable
+            nobs = mean_x = ssqdm_x = comp_add = comp_remove = 0.0
+            for j in range(start, i + 1):
+                nobs, mean_x, ssqdm_x, comp_add, unstable = _add_var(
+                    values[j], nobs, mean_x, ssqdm_x, comp_add, unstable
+                )
+            unstable = False
+
+        if nobs >= window and nobs > 0:
+            var = ssqdm_x / nobs
+            out[i] = 0.0 if var < 0.0 else np.sqrt(var)
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit
+def _span_alpha(span):
+    """Smoothing factor for ``span``, derived through ``com`` the way pandas does."""
+    com = (span - 1) / 2.0
+    return 1.0 / (1.0 + com)
+
+
+@njit
+def _ewm_step(weighted, old_wt, new_wt, alpha, cur):
+    """
+    Advance one pandas ``ewm(adjust=False)`` state by the observation ``cur``.
+
+    Returns the updated ``(weighted, old_wt, new_wt)``; ``weighted`` is NaN
+    until the first non-NaN observation and is the mean from then on.
+    """
+    is_obs = np.isfinite(cur)
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if alpha == 0.5:
+            # pandas quirk: with com == 1 (span 3) the new weight tracks the
+            # decayed old weight, which matters after NaN gaps
+            new_wt = 1.0 - old_wt
+        if is_obs:
+            if weighted != cur:
+                weighted = old_wt * weighted + new_wt * cur
+                weighted /= old_wt + new_wt
+            old_wt = 1.0
+    elif is_obs:
+        weighted = cur
+    return weighted, old_wt, new_wt
+
+
+@njit
+def _ewm_mean(values, span):
+    """pandas ``ewm(span=span, adjust=False).mean()`` over a float64 array."""
+    n = len(values)
+    out = np.empty(n, dtype=np.float64)
+    alpha = _span_alpha(span)
+    weighted = np.nan
+    old_wt = 1.0
+    new_wt = alpha
+    for i in range(n):
+        weighted, old_wt, new_wt = _ewm_step(weighted, old_wt, new_wt, alpha, values[i])
+        out[i] = weighted
+    return out
+
+
+@njit
+def _macd(values, fast, slow, signal):
+    """``indicators.macd`` in one pass: fast, slow and signal EMAs side by side."""
+    n = len(values)
+    line = np.empty(n, dtype=np.float64)
+    sig = np.empty(n, dtype=np.float64)
+    hist = np.empty(n, dtype=np.float64)
+    a_f = _span_alpha(fast)
+    a_s = _span_alpha(slow)
+    a_g = _span_alpha(signal)
+    ef = np.nan
+    es = np.nan
+    eg = np.nan
+    ow_f = ow_s = ow_g = 1.0
+    nw_f = a_f
+    nw_s = a_s
+    nw_g = a_g
+    for i in range(n):
+        cur = values[i]
+        ef, ow_f, nw_f = _ewm_step(ef, ow_f, nw_f, a_f, cur)
+        es, ow_s, nw_s = _ewm_step(es, ow_s, nw_s, a_s, cur)
+        m = ef - es
+        eg, ow_g, nw_g = _ewm_step(eg, ow_g, nw_g, a_g, m)
+        line[i] = m
+        sig[i] = eg
+        hist[i] = m - eg
+    return line, sig, hist
+
+
+@njit
+def _wilder_mean(values, window):
+    """
+    Wilder smoothing: seeded with the first full-window simple mean, then
+    pandas ``ewm(com=window - 1, adjust=False).mean()`` from there on.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    seed = _rolling_mean(values, window)
+    first = 0
+    while first < n and seed[first] != seed[first]:
+        first += 1
+    alpha = 1.0 / (1.0 + (window - 1.0))
+    weighted = np.nan
+    old_wt = 1.0
+    new_wt = alpha
+    for i in range(first, n):
+        cur = seed[i] if i == first else values[i]
+        weighted, old_wt, new_wt = _ewm_step(weighted, old_wt, new_wt, alpha, cur)
+        out[i] = weighted
+    return out
+
+
+@njit(error_model="numpy")
+def _rsi(values, window):
+    """``indicators.rsi``: Wilder-smoothed gains over Wilder-smoothed losses."""
+    n = len(values)
+    gain = np.empty(n, dtype=np.float64)
+    loss = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        delta = values[i] - values[i - 1] if i > 0 else np.nan
+        if delta != delta:
+            gain[i] = np.nan
+            loss[i] = np.nan
+        else:
+            gain[i] = delta if delta > 0.0 else 0.0
+            loss[i] = -delta if delta < 0.0 else -0.0
+    avg_gain = _wilder_mean(gain, window)
+    avg_loss = _wilder_mean(loss, window)
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        out[i] = 100.0 - 100.0 / (1.0 + avg_gain[i] / avg_loss[i])
+    return out
+
+
+# ----- Many symbols at once -----
+# One row per symbol, rows processed in parallel; each row is the 1-D kernel
+# above, so per-symbol results match the single-series indicators exactly.
+
+
+@njit(parallel=True)
+def _rolling_mean_rows(values, window):
+    out = np.empty_like(values)
+    for r in prange(values.shape[0]):
+        out[r] = _rolling_mean(values[r], window)
+    return out
+
+
+@njit(parallel=True)
+def _ewm_mean_rows(values, span):
+    out = np.empty_like(values)
+    for r in prange(values.shape[0]):
+        out[r] = _ewm_mean(values[r], span)
+    return out
+
+
+@njit(parallel=True)
+def _rsi_rows(values, window):
+    out = np.empty_like(values)
+    for r in prange(values.shape[0]):
+        out[r] = _rsi(values[r], window)
+    return out
+
+
+@njit(parallel=True)
+def _macd_rows(values, fast, slow, signal):
+    line = np.empty_like(values)
+    sig = np.empty_like(values)
+    hist = np.empty_like(values)
+    for r in prange(values.shape[0]):
+        line[r], sig[r], hist[r] = _macd(values[r], fast, slow, signal)
+    return line, sig, hist
+
+
+@njit(nogil=True)
+def _crossover_loop(a, b, out):
+    """out[i] = a crosses above b at bar i; one fused pass, out[0] left untouched."""
+    for i in range(1, len(a)):
+        out[i] = (a[i] > b[i]) and (a[i - 1] <= b[i - 1])
+
+
+@njit(nogil=True)
+def _crossunder_loop(a, b, out):
+    """out[i] = a crosses below b at bar i; one fused pass, out[0] left untouched."""
+    for i in range(1, len(a)):
+        out[i] = (a[i] < b[i]) and (a[i - 1] >= b[i - 1])
+
+
+# ----- Expression tape -----
+# A strategy expression flattened to post-order instructions (see
+# codegen.ast_to_tape). Instruction t writes slot t; operands refer to earlier
+# slots by index. Every slot is a float64 row, booleans stored as 0.0/1.0.
+
+OP_CONST = 0  # fill with fargs[t]
+OP_COLUMN = 1  # column name_ids[t], lagged by iargs[t] bars
+OP_ADD = 2
+OP_SUB = 3
+OP_MUL = 4
+OP_DIV = 5
+OP_GT = 6
+OP_LT = 7
+OP_GE = 8
+OP_LE = 9
+OP_EQ = 10
+OP_NE = 11
+OP_AND = 12
+OP_OR = 13
+OP_NOT = 14
+OP_SMA = 20  # window iargs[t]
+OP_EMA = 21
+OP_RSI = 22
+OP_SHIFT = 23
+OP_CROSSOVER = 30
+OP_CROSSUNDER = 31
+
+
+@njit(error_model="numpy")
+def eval_tape(opcodes, lefts, rights, iargs, fargs, name_ids, columns, roots):
+    """
+    Run a tape over a (n_columns, n_bars) float64 matrix.
+
+    Returns a bool matrix with one row per slot in ``roots``; a row is True
+    where the slot is non-zero (NaN counts as True, like ``astype(bool)``).
+    """
+    n = columns.shape[1]
+    slots = np.empty((len(opcodes), n), dtype=np.float64)
+    for t in range(len(opcodes)):
+        code = opcodes[t]
+        out = slots[t]
+        if code == OP_CONST:
+            out[:] = fargs[t]
+        elif code == OP_COLUMN or code == OP_SHIFT:
+            src = columns[name_ids[t]] if code == OP_COLUMN else slots[lefts[t]]
+            k = iargs[t]
+            for i in range(n):
+                j = i - k
+                out[i] = src[j] if 0 <= j < n else np.nan
+        elif code == OP_SMA:
+            out[:] = _rolling_mean(slots[lefts[t]], iargs[t])
+        elif code == OP_EMA:
+            out[:] = _ewm_mean(slots[lefts[t]], iargs[t])
+        elif code == OP_RSI:
+            out[:] = _rsi(slots[lefts[t]], iargs[t])
+        elif code == OP_NOT:
+            a = slots[lefts[t]]
+            for i in range(n):
+                out[i] = 0.0 if a[i] != 0.0 else 1.0
+        elif code == OP_CROSSOVER or code == OP_CROSSUNDER:
+            a = slots[lefts[t]]
+            b = slots[rights[t]]
+            if n > 0:
+                out[0] = 0.0
+            for i in range(1, n):
+                if code == OP_CROSSOVER:
+                    hit = a[i] > b[i] and a[i - 1] <= b[i - 1]
+                else:
+                    hit = a[i] < b[i] and a[i - 1] >= b[i - 1]
+                out[i] = 1.0 if hit else 0.0
+        else:
+            a = slots[lefts[t]]
+            b = slots[rights[t]]
+            for i in range(n):
+                x = a[i]
+                y = b[i]
+                if code == OP_ADD:
+                    out[i] = x + y
+                elif code == OP_SUB:
+                    out[i] = x - y
+                elif code == OP_MUL:
+                    out[i] = x * y
+                elif code == OP_DIV:
+                    out[i] = x / y
+                elif code == OP_GT:
+                    out[i] = 1.0 if x > y else 0.0
+                elif code == OP_LT:
+                    out[i] = 1.0 if x < y else 0.0
+                elif code == OP_GE:
+                    out[i] = 1.0 if x >= y else 0.0
+                elif code == OP_LE:
+                    out[i] = 1.0 if x <= y else 0.0
+                elif code == OP_EQ:
+                    out[i] = 1.0 if x == y else 0.0
+                elif code == OP_NE:
+                    out[i] = 1.0 if x != y else 0.0
+                elif code == OP_AND:
+                    out[i] = 1.0 if x != 0.0 and y != 0.0 else 0.0
+                else:  # OP_OR
+                    out[i] = 1.0 if x != 0.0 or y != 0.0 else 0.0
+
+    result = np.empty((len(roots), n), dtype=np.bool_)
+    for r in range(len(roots)):
+        src = slots[roots[r]]
+        for i in range(n):
+            result[r, i] = src[i] != 0.0
+    return result
+
+
+def _make_sma(window: int):
+    @njit
+    def kernel(values):
+        return _rolling_mean(values, window)
+
+    return kernel
+
+
+def _make_ema(window: int):
+    @njit
+    def kernel(values):
+        return _ewm_mean(values, window)
+
+    return kernel
+
+
+def _make_rsi(window: int):
+    @njit
+    def kernel(values):
+        return _rsi(values, window)
+
+    return kernel
+
+
+_FACTORIES: Dict[str, Callable[[int], Callable[[np.ndarray], np.ndarray]]] = {
+    "SMA": _make_sma,
+    "EMA": _make_ema,
+    "RSI": _make_rsi,
+}
+
+# Process-wide cache of compiled kernels keyed by (indicator, window)
+_SPECIALIZED: Dict[Tuple[str, int], Callable[[np.ndarray], np.ndarray]] = {}
+
+
+def specialized_kernel(name: str, window: int) -> Callable[[np.ndarray], np.ndarray]:
+    """Return the kernel for indicator ``name`` (SMA/EMA/RSI) with a fixed ``window``."""
+    key = (name, int(window))
+    kernel = _SPECIALIZED.get(key)
+    if kernel is None:
+        kernel = _FACTORIES[name](key[1])
+        _SPECIALIZED[key] = kernel
+    return kernel
+
+
+__all__ = ["specialized_kernel", "eval_tape", "_crossover_loop", "_crossunder_loop"]
@@ -0,0 +1,31 @@
+"""
+Optional Numba support.
+
+Exposes ``njit`` and ``prange`` resolved from Numba when it is installed, and
+no-op stand-ins otherwise, so kernels decorated with them stay importable and
+run as plain Python without the dependency. ``HAS_NUMBA`` lets callers pick a
+vectorized NumPy path instead of an interpreted loop when Numba is missing.
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit, prange  # type: ignore
+
+    HAS_NUMBA = True
+except ImportError:  # numba is optional
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit supporting bare and called forms."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit", "prange", "HAS_NUMBA"]
@@ -1,19 +1,27 @@
 """
 AST node definitions for the trading strategy DSL.
+
+Nodes are immutable (frozen) and hashable, so identical subtrees compare and
+hash equal and can be shared or used as cache keys. On Python 3.10+ they also
+use __slots__, which drops the per-instance __dict__.
 """
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from typing import List, Union
+from typing import Tuple, Union
+
+# dataclass(slots=True) requires Python 3.10+
+_NODE_OPTIONS = {"frozen": True, "slots": True} if sys.version_info >= (3, 10) else {"frozen": True}
 
 
 class ASTNode:
     """Base class for all AST nodes."""
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(**_NODE_OPTIONS)
 class Strategy(ASTNode):
     """
     Top-level strategy node.
@@ -24,7 +32,7 @@ class Strategy(ASTNode):
     exit: ASTNode
 
 
-@dataclass
+@dataclass(**_NODE_OPTIONS)
 class BinaryOp(ASTNode):
     """
     Binary operation node.
@@ -41,7 +49,7 @@ class BinaryOp(ASTNode):
     right: ASTNode
 
 
-@dataclass
+@dataclass(**_NODE_OPTIONS)
 class UnaryOp(ASTNode):
     """
     Unary operation node.
@@ -52,7 +60,7 @@ class UnaryOp(ASTNode):
     operand: ASTNode
 
 
-@dataclass
+@dataclass(**_NODE_OPTIONS)
 class Literal(ASTNode):
     """
     Numeric literal, e.g. 1000000, 30.5, etc.
@@ -60,7 +68,7 @@ class Literal(ASTNode):
     value: float
 
 
-@dataclass
+@dataclass(**_NODE_OPTIONS)
 class SeriesRef(ASTNode):
     """
     Reference to a time series column with optional lag.
@@ -74,7 +82,7 @@ class SeriesRef(ASTNode):
     lag: int = 0
 
 
-@dataclass
+@dataclass(**_NODE_OPTIONS)
 class FuncCall(ASTNode):
     """
     Function call node.
@@ -86,6 +94,11 @@ class FuncCall(ASTNode):
         RSI(close, 14)
     """
     name: str
-    args: List[ASTNode]
+    args: Tuple[ASTNode, ...]
+
+    def __post_init__(self):
+        # Accept any sequence but store a tuple so the node stays hashable
+        if not isinstance(self.args, tuple):
+            object.__setattr__(self, "args", tuple(self.args))
 
 ASTChild = Union[Strategy, BinaryOp, UnaryOp, Literal, SeriesRef, FuncCall]
@@ -9,11 +9,21 @@ Assumptions:
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
 from dataclasses import dataclass
 from typing import Any, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
+# Import with fallback for script execution
+try:
+    from ._njit import njit, HAS_NUMBA
+except ImportError:  # script mode
+    from _njit import njit, HAS_NUMBA  # type: ignore
+
 
 @dataclass
 class Trade:
@@ -25,6 +35,58 @@ class Trade:
     return_pct: float
 
 
+# Columnar trade storage: one record per closed trade, dates kept as bar
+# positions into the backtested frame's index
+_TRADE_DTYPE = np.dtype([
+  ('entry_idx', np.int64),
+  ('exit_idx', np.int64),
+  ('entry_price', np.float64),
+  ('exit_price', np.float64),
+  ('pnl', np.float64),
+  ('return_pct', np.float64),
+])
+
+
+class TradeLog(Sequence):
+  """
+  Read-only sequence of trades backed by a NumPy structured array.
+
+  Indexing or iterating yields Trade objects built on access, and a log
+  compares equal to a list (or another log) holding the same trades, so
+  callers that treat the result as a list of trades keep working. Use
+  ``records`` for columnar work, e.g. ``log.records['pnl'].sum()``.
+  """
+
+  def __init__(self, records, index):
+    self.records = records
+    self._index = index
+
+  def __len__(self):
+    return len(self.records)
+
+  def __getitem__(self, i):
+    if isinstance(i, slice):
+      return [self[j] for j in range(*i.indices(len(self)))]
+    # item() converts the whole record to Python scalars in one call
+    entry_idx, exit_idx, entry_price, exit_price, pnl, return_pct = self.records[i].item()
+    return Trade(
+      entry_date=pd.Timestamp(self._index[entry_idx]),
+      exit_date=pd.Timestamp(self._index[exit_idx]),
+      entry_price=entry_price,
+      exit_price=exit_price,
+      pnl=pnl,
+      return_pct=return_pct,
+    )
+
+  def __eq__(self, other):
+    if not isinstance(other, (TradeLog, list)):
+      return NotImplemented
+    return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+  def __repr__(self):
+    return f"TradeLog({len(self)} trades)"
+
+
 def run_backtest(df, signals, position_size: float = 1.0, slippage_bps: float = 0.0, fee_per_trade: float = 0.0, mark_to_market: bool = False):
   """
         Execute a simple long-only backtest over df using 'signals' with boolean 'entry' and 'exit' columns.
@@ -36,17 +98,18 @@ def run_backtest(df, signals, position_size: float = 1.0, slippage_bps: float =
           - PnL = exit_price - entry_price, return_pct = pnl / entry_price
 
         Returns:
-          (trades_list, stats_dict)
+          (trades, stats_dict)
 
-        trades_list: list of dicts:
-          {
-            'entry_date': pd.Timestamp,
-            'exit_date': pd.Timestamp,
-            'entry_price': float,
-            'exit_price': float,
-            'pnl': float,
-            'return_pct': float
-          }
+        trades: TradeLog, a sequence of Trade objects:
+          Trade(
+            entry_date=pd.Timestamp,
+            exit_date=pd.Timestamp,
+            entry_price=float,
+            exit_price=float,
+            pnl=float,
+            return_pct=float
+          )
+          trades.records holds the same data as a structured ndarray.
 
         stats_dict:
           {
@@ -55,79 +118,161 @@ def run_backtest(df, signals, position_size: float = 1.0, slippage_bps: float =
             'num_trades': int
           }
   """
-  import pandas as pd
+  index = df.index
+  close, entry, exit_ = _signal_arrays(df, signals)
 
-  position = 0
-  entry_date = None
-  entry_price = None
-  prev_close_in_position = None
-  trades = []
+  records, equity = _execute(close, entry, exit_, position_size, slippage_bps, fee_per_trade, mark_to_market)
+  return _summarize(records, equity, index)
 
-  equity = []
-  cumulative_equity = 1.0
-  equity_index = []
 
-  for idx in df.index:
-    entry_sig = bool(signals.loc[idx, 'entry'])
-    exit_sig = bool(signals.loc[idx, 'exit'])
-    close_price = float(df.loc[idx, 'close'])
+def run_backtest_batch(df, signals, params_list, max_workers=None):
+  """
+  Run run_backtest once per parameter set, spreading the sets over processes.
 
-    # Entry
-    if entry_sig and position == 0:
-      position = 1
-      entry_date = pd.Timestamp(idx)
-      # apply slippage on entry
-      entry_price = close_price * (1 + slippage_bps / 10000.0)
-      prev_close_in_position = close_price  # baseline for mark-to-market
+  params_list is a sequence of dicts of run_backtest keyword arguments
+  (position_size, slippage_bps, fee_per_trade, mark_to_market). The close and
+  signal arrays are written once to a shared memory block that every worker
+  maps read-only, so nothing frame-sized is pickled per task.
+
+  Returns a list of (trades, stats) tuples in the order of params_list.
+  """
+  index = df.index
+  n = len(df)
+  close, entry, exit_ = _signal_arrays(df, signals)
+  _check_lengths(close, entry, exit_)
+  params_list = [dict(p) for p in params_list]
+  for p in params_list:
+    unknown = sorted(set(p) - set(_BACKTEST_PARAMS))
+    if unknown:
+      raise TypeError(f"run_backtest_batch() got unexpected run_backtest parameter(s): {', '.join(map(repr, unknown))}")
+
+  if max_workers == 1 or len(params_list) <= 1:
+    return [
+      _summarize(*_execute(close, entry, exit_, **_backtest_kwargs(p)), index)
+      for p in params_list
+    ]
+
+  # Layout: close (float64) | entry (bool) | exit (bool)
+  shm = shared_memory.SharedMemory(create=True, size=max(n * 10, 1))
+  try:
+    shared_close, shared_entry, shared_exit = _shared_views(shm, n)
+    shared_close[:] = close
+    shared_entry[:] = entry
+    shared_exit[:] = exit_
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_batch_init, initargs=(shm.name, n)) as pool:
+      results = list(pool.map(_batch_run, params_list))
+  finally:
+    shm.close()
+    shm.unlink()
+
+  return [_summarize(records, equity, index) for records, equity in results]
+
+
+def _signal_arrays(df, signals):
+  """
+  Close, entry and exit as NumPy arrays aligned to df's rows.
+
+  Signals are used positionally only when they share df's index; otherwise they
+  are aligned by label through signals.loc, which raises KeyError for labels of
+  df missing from signals.
+  """
+  close = df['close'].to_numpy(dtype=np.float64)
+  if not signals.index.equals(df.index):
+    signals = signals.loc[df.index, ['entry', 'exit']]
+  entry = signals['entry'].to_numpy(dtype=np.bool_)
+  exit_ = signals['exit'].to_numpy(dtype=np.bool_)
+  return close, entry, exit_
+
+
+def _check_lengths(close, entry, exit_):
+  """Raise ValueError unless the signal arrays have one value per bar."""
+  # The compiled loop does not bounds-check entry/exit against len(close)
+  if not len(entry) == len(exit_) == len(close):
+    raise ValueError(
+      f"signals have {len(entry)} entry and {len(exit_)} exit rows for {len(close)} bars; lengths must match"
+    )
+
+
+# run_backtest keyword arguments a params_list entry may set
+_BACKTEST_PARAMS = ('position_size', 'slippage_bps', 'fee_per_trade', 'mark_to_market')
+
+
+def _backtest_kwargs(params):
+  return {
+    'position_size': params.get('position_size', 1.0),
+    'slippage_bps': params.get('slippage_bps', 0.0),
+    'fee_per_trade': params.get('fee_per_trade', 0.0),
+    'mark_to_market': params.get('mark_to_market', False),
+  }
+
+
+def _shared_views(shm, n):
+  close = np.ndarray((n,), dtype=np.float64, buffer=shm.buf, offset=0)
+  entry = np.ndarray((n,), dtype=np.bool_, buffer=shm.buf, offset=n * 8)
+  exit_ = np.ndarray((n,), dtype=np.bool_, buffer=shm.buf, offset=n * 9)
+  return close, entry, exit_
+
+
+# Per-worker state set by _batch_init: the attached block and its array views
+_batch_state = {}
 
-    # Exit
-    if exit_sig and position == 1:
-      position = 0
-      exit_date = pd.Timestamp(idx)
-      # apply slippage on exit (sell worse by bps)
-      exit_price = close_price * (1 - slippage_bps / 10000.0)
-      pnl = float(exit_price - entry_price)
-      # include fee per trade (flat) proportional to entry price for percent terms
-      fee_pct = (fee_per_trade / entry_price) if entry_price and fee_per_trade > 0 else 0.0
-      ret_pct = float(pnl / entry_price) - fee_pct if entry_price else 0.0
-
-      trades.append(Trade(
-        entry_date=entry_date,
-        exit_date=exit_date,
-        entry_price=float(entry_price),
-        exit_price=float(exit_price),
-        pnl=float(pnl),
-        return_pct=float(ret_pct),
-      ))
-      cumulative_equity *= (1.0 + ret_pct * position_size)
-      prev_close_in_position = None
-
-    # Optional mark-to-market equity update while holding
-    if mark_to_market and position == 1 and prev_close_in_position is not None and not exit_sig:
-      # Multiply equity by bar return scaled by position_size
-      bar_ret = 0.0
-      if prev_close_in_position != 0.0:
-        bar_ret = (close_price / prev_close_in_position) - 1.0
-      cumulative_equity *= (1.0 + bar_ret * position_size)
-      prev_close_in_position = close_price
-
-    equity.append(float(cumulative_equity))
-    equity_index.append(idx)
-
-  equity_series = pd.Series(equity, index=equity_index)
-  peak = equity_series.cummax()
-  drawdown = (equity_series / peak) - 1.0
-  max_drawdown_pct = float(drawdown.min()) if len(drawdown) else 0.0
-  total_return_pct = float((cumulative_equity - 1.0) * 100.0)
-  max_drawdown_pct *= 100.0
-  num_trades = int(len(trades))
 
-  # Daily returns for Sharpe (assume equity sampled by row frequency)
-  rets = equity_series.pct_change().fillna(0.0)
-  if rets.std(ddof=0) > 0:
-    sharpe = float((rets.mean() / rets.std(ddof=0)) * (252 ** 0.5))
+def _batch_init(shm_name, n):
+  shm = shared_memory.SharedMemory(name=shm_name)
+  arrays = _shared_views(shm, n)
+  for view in arrays:
+    view.setflags(write=False)
+  _batch_state['shm'] = shm
+  _batch_state['arrays'] = arrays
+  # Pool workers leave through multiprocessing's exit path, which runs these
+  # finalizers but not atexit hooks
+  util.Finalize(None, _batch_close, exitpriority=0)
+
+
+def _batch_close():
+  # Drop the views first: a block with live buffer exports cannot be closed
+  _batch_state.pop('arrays', None)
+  shm = _batch_state.pop('shm', None)
+  if shm is not None:
+    shm.close()
+
+
+def _batch_run(params):
+  close, entry, exit_ = _batch_state['arrays']
+  return _execute(close, entry, exit_, **_backtest_kwargs(params))
+
+
+def _execute(close, entry, exit_, position_size, slippage_bps, fee_per_trade, mark_to_market):
+  """Run the state machine (compiled kernel when available) and pack closed trades as records."""
+  _check_lengths(close, entry, exit_)
+  if HAS_NUMBA:
+    entry_idx, exit_idx, entry_px, exit_px, pnl, ret, equity, count = _run_kernel(
+      close, entry, exit_, float(position_size), float(slippage_bps), float(fee_per_trade), bool(mark_to_market)
+    )
+    entry_idx, exit_idx = entry_idx[:count], exit_idx[:count]
+    entry_px, exit_px, pnl, ret = entry_px[:count], exit_px[:count], pnl[:count], ret[:count]
   else:
-    sharpe = 0.0
+    entry_idx, exit_idx, entry_px, exit_px, pnl, ret, equity = _simulate(
+      close, entry, exit_, position_size, slippage_bps, fee_per_trade, mark_to_market
+    )
+
+  records = np.empty(len(exit_idx), dtype=_TRADE_DTYPE)
+  records['entry_idx'] = entry_idx
+  records['exit_idx'] = exit_idx
+  records['entry_price'] = entry_px
+  records['exit_price'] = exit_px
+  records['pnl'] = pnl
+  records['return_pct'] = ret
+  return records, equity
+
+
+def _summarize(records, equity, index):
+  """Wrap trade records and the equity curve into run_backtest's (trades, stats) result."""
+  trades = TradeLog(records, index)
+  cumulative_equity = float(equity[-1]) if len(equity) else 1.0
+  total_return_pct = float((cumulative_equity - 1.0) * 100.0)
+  num_trades = int(len(trades))
+  max_drawdown_pct, sharpe = _equity_stats(equity)
 
   stats = {
     'total_return_pct': total_return_pct,
@@ -139,4 +284,149 @@ def run_backtest(df, signals, position_size: float = 1.0, slippage_bps: float =
   return trades, stats
 
 
-# Module provides run_backtest(df, signals) and Trade dataclass; no top-level execution.
+def _equity_stats(equity):
+  """
+  Max drawdown (percent) and annualized Sharpe from a per-bar equity curve.
+
+  Works directly on the raw float64 buffer; peaks come from a NumPy running
+  max rather than a pandas cummax, so no index is built or aligned.
+  """
+  equity = np.asarray(equity, dtype=np.float64)
+  if not len(equity):
+    return 0.0, 0.0
+
+  with np.errstate(divide='ignore', invalid='ignore'):
+    peak = np.maximum.accumulate(equity)
+    drawdown = np.where(peak != 0, equity / peak - 1.0, 0.0)
+    # Daily returns for Sharpe (assume equity sampled by row frequency)
+    rets = np.empty_like(equity)
+    rets[0] = 0.0
+    rets[1:] = equity[1:] / equity[:-1] - 1.0
+  drawdown = drawdown[~np.isnan(drawdown)]
+  max_drawdown_pct = float(drawdown.min()) * 100.0 if len(drawdown) else float('nan')
+  rets[np.isnan(rets)] = 0.0
+  sharpe = 0.0
+  std = rets.std()
+  if std > 0:
+    sharpe = float((rets.mean() / std) * (252 ** 0.5))
+  return max_drawdown_pct, sharpe
+
+
+def _simulate(close, entry, exit_, position_size, slippage_bps, fee_per_trade, mark_to_market):
+  """
+  Vectorized long-only state machine over aligned close/entry/exit arrays.
+
+  The position after bar i is flat if exit fires, long if entry fires, otherwise
+  unchanged (exit wins, so an entry and exit on the same flat bar open and close
+  a trade there). That makes the position a forward-fill of the last event.
+
+  Returns (entry_idx, exit_idx, entry_px, exit_px, pnl, ret, equity) where the
+  first six hold one element per closed trade and equity has one value per bar.
+  """
+  n = len(close)
+  bars = np.arange(n)
+
+  # Post-bar position: forward-fill the index of the last bar carrying an event
+  has_event = entry | exit_
+  last_event = np.maximum.accumulate(np.where(has_event, bars, -1)) if n else bars
+  post = np.zeros(n, dtype=np.int8)
+  seen = last_event >= 0
+  post[seen] = ~exit_[last_event[seen]]
+  pre = np.zeros(n, dtype=np.int8)
+  pre[1:] = post[:-1]
+
+  enters = entry & (pre == 0)
+  exits = exit_ & ((pre == 1) | enters)
+  exit_idx = np.flatnonzero(exits)
+  # Trades alternate strictly; a trailing entry without an exit stays open
+  entry_idx = np.flatnonzero(enters)[: len(exit_idx)]
+
+  entry_px = close[entry_idx] * (1 + slippage_bps / 10000.0)
+  exit_px = close[exit_idx] * (1 - slippage_bps / 10000.0)
+  pnl = exit_px - entry_px
+  has_px = entry_px != 0.0
+  safe_px = np.where(has_px, entry_px, 1.0)
+  fee_pct = fee_per_trade / safe_px if fee_per_trade > 0 else 0.0
+  ret = np.where(has_px, pnl / safe_px - fee_pct, 0.0)
+
+  # Equity is the running product of per-bar growth factors
+  factor = np.ones(n, dtype=np.float64)
+  if mark_to_market and n > 1:
+    prev = close[:-1]
+    held = (pre[1:] == 1) & ~exit_[1:]
+    nonzero = prev != 0.0
+    bar_ret = np.where(nonzero, close[1:] / np.where(nonzero, prev, 1.0) - 1.0, 0.0)
+    factor[1:] = np.where(held, 1.0 + bar_ret * position_size, 1.0)
+  factor[exit_idx] = 1.0 + ret * position_size
+  # Scan in place: the factor buffer becomes the equity curve
+  equity = np.cumprod(factor, out=factor)
+
+  return entry_idx, exit_idx, entry_px, exit_px, pnl, ret, equity
+
+
+# No on-disk cache: this module is imported both as nl_dsl_strategy.src.backtest
+# and, in script mode, as top-level backtest, and a cache entry written under
+# one name fails to load under the other.
+@njit
+def _run_kernel(close, entry, exit_, position_size, slippage_bps, fee_per_trade, mtm):
+  """
+  Sequential state machine compiled with Numba (see run_backtest for the rules).
+
+  Trade outputs are preallocated to len(close): an entry and exit on the same
+  bar close a trade there, so every bar can produce one. Returns the arrays of
+  _simulate plus the number of filled trade slots.
+  """
+  n = len(close)
+  entry_idx = np.empty(n, dtype=np.int64)
+  exit_idx = np.empty(n, dtype=np.int64)
+  entry_px = np.empty(n, dtype=np.float64)
+  exit_px = np.empty(n, dtype=np.float64)
+  pnl = np.empty(n, dtype=np.float64)
+  ret = np.empty(n, dtype=np.float64)
+  equity = np.empty(n, dtype=np.float64)
+
+  # Per-bar mark-to-market growth, computed up front so the loop only picks it
+  # up while holding. A held bar's previous close is always close[i - 1].
+  hold_factor = np.ones(n, dtype=np.float64)
+  if mtm:
+    for i in range(1, n):
+      if close[i - 1] != 0.0:
+        hold_factor[i] = 1.0 + (close[i] / close[i - 1] - 1.0) * position_size
+
+  position = 0
+  count = 0
+  open_idx = 0
+  open_px = 0.0
+  cumulative_equity = 1.0
+
+  for i in range(n):
+    price = close[i]
+    if entry[i] and position == 0:
+      position = 1
+      open_idx = i
+      open_px = price * (1 + slippage_bps / 10000.0)
+
+    if exit_[i] and position == 1:
+      position = 0
+      px = price * (1 - slippage_bps / 10000.0)
+      trade_pnl = px - open_px
+      fee_pct = fee_per_trade / open_px if open_px != 0.0 and fee_per_trade > 0 else 0.0
+      trade_ret = trade_pnl / open_px - fee_pct if open_px != 0.0 else 0.0
+      entry_idx[count] = open_idx
+      exit_idx[count] = i
+      entry_px[count] = open_px
+      exit_px[count] = px
+      pnl[count] = trade_pnl
+      ret[count] = trade_ret
+      count += 1
+      cumulative_equity *= 1.0 + trade_ret * position_size
+    elif position == 1:
+      # Still long after this bar; the entry bar itself has factor 1.0 below
+      cumulative_equity *= hold_factor[i] if i != open_idx else 1.0
+
+    equity[i] = cumulative_equity
+
+  return entry_idx, exit_idx, entry_px, exit_px, pnl, ret, equity, count
+
+
+# Module provides run_backtest(df, signals), run_backtest_batch, Trade and TradeLog; no top-level execution.
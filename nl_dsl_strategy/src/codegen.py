@@ -4,14 +4,25 @@ AST → pandas signal generation.
 This module takes a parsed Strategy AST and evaluates it over a pandas DataFrame
 containing OHLCV data, producing boolean entry/exit signal series.
 
-Main entry point:
+Each AST is first compiled into nested closures (one per node), so type
+dispatch happens once rather than on every evaluation. The closures run on
+plain NumPy arrays: the OHLCV columns are extracted once, every node produces
+an ndarray (or a scalar for literals), and only the final entry/exit results
+are wrapped back into pandas with the original index. This skips pandas index
+alignment on every intermediate operation.
+
+Main entry points:
 - generate_signals(strategy, df) -> DataFrame with 'entry' and 'exit' columns
+- compile_ast(node) -> callable evaluating node over a dict of column arrays
 """
 
 from __future__ import annotations
 
-from typing import Union
+import operator
+from functools import lru_cache
+from typing import Dict, Hashable, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 # Import with fallback for script execution
@@ -25,7 +36,11 @@ try:
         UnaryOp,
         BinaryOp,
     )
-    from .indicators import sma, ema, rsi, macd, bbands, bbupper, bblower, macd_signal, macd_hist
+    from .indicators import sma, ema, rsi, macd, bbands
+    from .validator import validate_indicator, VALID_SERIES, ALLOWED_INDICATORS
+    from . import _kernels
+    from ._kernels import specialized_kernel, _crossover_loop, _crossunder_loop
+    from ._njit import HAS_NUMBA
 except ImportError:  # script mode
     from ast_nodes import (  # type: ignore
         ASTNode,
@@ -36,262 +51,952 @@ except ImportError:  # script mode
         UnaryOp,
         BinaryOp,
     )
-    from indicators import sma, ema, rsi, macd, bbands, bbupper, bblower, macd_signal, macd_hist  # type: ignore
+    from indicators import sma, ema, rsi, macd, bbands  # type: ignore
+    from validator import validate_indicator, VALID_SERIES, ALLOWED_INDICATORS  # type: ignore
+    import _kernels  # type: ignore
+    from _kernels import specialized_kernel, _crossover_loop, _crossunder_loop  # type: ignore
+    from _njit import HAS_NUMBA  # type: ignore
+
+try:
+    import numexpr  # type: ignore
+
+    HAS_NUMEXPR = True
+except ImportError:  # numexpr is optional
+    numexpr = None
+    HAS_NUMEXPR = False
 
 
-def eval_ast(node: ASTNode, df: pd.DataFrame) -> Union[pd.Series, float, bool]:
+def _ast_key(node: ASTNode, keys: Dict[int, Hashable]) -> Hashable:
     """
-    Evaluate an AST node over a pandas DataFrame.
+    Structural key for an AST subtree.
 
-    Depending on the node, this can return:
-    - A scalar (float/bool) for literals
-    - A pandas Series for time-series expressions
-    - A boolean Series for boolean expressions/comparisons
+    Identical subtrees (e.g. two SMA(close, 20) calls) map to the same key.
+    ``keys`` memoizes by id(node) so each node is keyed once per evaluation.
+    """
+    key = keys.get(id(node))
+    if key is not None:
+        return key
+    if isinstance(node, Literal):
+        key = ("L", node.value)
+    elif isinstance(node, SeriesRef):
+        key = ("S", node.name, node.lag)
+    elif isinstance(node, FuncCall):
+        key = (node.name.upper(), tuple(_ast_key(a, keys) for a in node.args))
+    elif isinstance(node, UnaryOp):
+        key = ("U", node.op.upper(), _ast_key(node.operand, keys))
+    elif isinstance(node, BinaryOp):
+        key = ("B", node.op.upper(), _ast_key(node.left, keys), _ast_key(node.right, keys))
+    else:
+        key = ("id", id(node))
+    keys[id(node)] = key
+    return key
 
-    Parameters
-    ----------
-    node : ASTNode
-        AST node to evaluate.
-    df : pd.DataFrame
-        Input OHLCV data. Must contain columns like 'open', 'high',
-        'low', 'close', 'volume'.
 
-    Returns
-    -------
-    Union[pd.Series, float, bool]
-        Result of the evaluation.
+def _lag(arr: np.ndarray, k: int) -> np.ndarray:
+    """Shift an array by k bars (like Series.shift), filling vacated slots with NaN."""
+    if k == 0:
+        return arr
+    out = np.empty(len(arr), dtype=np.float64)
+    if k > 0:
+        out[:k] = np.nan
+        out[k:] = arr[:-k]
+    else:
+        out[k:] = np.nan
+        out[:k] = arr[-k:]
+    return out
+
+
+def _crossover(left: np.ndarray, right: np.ndarray, under: bool = False) -> np.ndarray:
     """
-    # ----- Leaf nodes -----
+    Cross events between two arrays (Numba loop if available, else slice views).
+
+    Over (default): left > right now and left <= right on the previous bar.
+    Under: left < right now and left >= right on the previous bar.
+    The first bar never crosses.
+    """
+    a = np.asarray(left)
+    b = np.asarray(right)
+    out = np.zeros(len(a), dtype=bool)
+    if HAS_NUMBA:
+        # Compiled loop: both comparisons and the lag fused into one pass
+        (_crossunder_loop if under else _crossover_loop)(a, b, out)
+    elif under:
+        np.logical_and(a[1:] < b[1:], a[:-1] >= b[:-1], out=out[1:])
+    else:
+        np.logical_and(a[1:] > b[1:], a[:-1] <= b[:-1], out=out[1:])
+    return out
+
+
+def _cross(op: str, left, right) -> np.ndarray:
+    """Dispatch CROSSOVER/CROSSUNDER after checking both operands are series."""
+    if not isinstance(left, np.ndarray) or not isinstance(right, np.ndarray):
+        raise TypeError(f"{op} operands must be pandas Series")
+    return _crossover(left, right, under=(op == "CROSSUNDER"))
+
+
+# ----- FuncCall handlers -----
+# Each takes the evaluated argument list (ndarrays or scalars) and returns an
+# ndarray. Indicators are pandas-based, so series arguments are wrapped once
+# on the way in and unwrapped on the way out.
+
+def _series_arg(func_name: str, args: list) -> np.ndarray:
+    series = args[0]
+    if not isinstance(series, np.ndarray):
+        raise TypeError(f"{func_name} first argument must be a Series")
+    return series
+
+
+def _indicator(fn, arr: np.ndarray, *params, **kwargs):
+    out = fn(pd.Series(arr, copy=False), *params, **kwargs)
+    if isinstance(out, tuple):
+        return tuple(o.to_numpy() for o in out)
+    return out.to_numpy()
+
+
+def _windowed(func_name: str, fn, args: list) -> np.ndarray:
+    """SMA/EMA/RSI: use the window-specialized Numba kernel when available."""
+    if len(args) != 2:
+        raise ValueError(f"{func_name}(series, window) expects 2 arguments")
+    series = _series_arg(func_name, args)
+    window = int(args[1])
+    # Invalid windows go through pandas so they raise its usual errors
+    if HAS_NUMBA and window >= 1 and series.dtype == np.float64:
+        return specialized_kernel(func_name, window)(series)
+    return _indicator(fn, series, window)
+
+
+def _do_sma(args):
+    return _windowed("SMA", sma, args)
+
+
+def _do_ema(args):
+    return _windowed("EMA", ema, args)
+
+
+def _do_rsi(args):
+    return _windowed("RSI", rsi, args)
+
+
+def _do_shift(args):
+    if len(args) != 2:
+        raise ValueError("SHIFT(series, lag) expects 2 arguments")
+    return _lag(_series_arg("SHIFT", args), int(args[1]))
+
+
+def _macd_params(func_name: str, args: list):
+    if len(args) < 1 or len(args) > 4:
+        raise ValueError(f"{func_name}(series, fast=12, slow=26, signal=9) expects 1-4 arguments")
+    series = _series_arg(func_name, args)
+    fast = int(args[1]) if len(args) >= 2 else 12
+    slow = int(args[2]) if len(args) >= 3 else 26
+    signal = int(args[3]) if len(args) >= 4 else 9
+    return series, fast, slow, signal
+
+
+def _bb_params(func_name: str, args: list):
+    if len(args) < 1 or len(args) > 3:
+        raise ValueError(f"{func_name}(series, period=20, std=2.0) expects 1-3 arguments")
+    series = _series_arg(func_name, args)
+    period = int(args[1]) if len(args) >= 2 else 20
+    std = float(args[2]) if len(args) >= 3 else 2.0
+    return series, period, std
+
+
+def _macd_lines(func_name: str, args: list, cache: Dict[Hashable, object], series_key: Hashable):
+    """(macd_line, signal_line, hist), computed once per series and parameters per evaluation."""
+    series, fast, slow, signal = _macd_params(func_name, args)
+    key = ("MACD*", series_key, fast, slow, signal)
+    lines = cache.get(key)
+    if lines is None:
+        lines = _indicator(macd, series, fast=fast, slow=slow, signal=signal)
+        cache[key] = lines
+    return lines
+
+
+def _bb_lines(func_name: str, args: list, cache: Dict[Hashable, object], series_key: Hashable):
+    """(upper, middle, lower) bands, computed once per series and parameters per evaluation."""
+    series, period, std = _bb_params(func_name, args)
+    key = ("BB*", series_key, period, std)
+    lines = cache.get(key)
+    if lines is None:
+        lines = _indicator(bbands, series, period=period, std=std)
+        cache[key] = lines
+    return lines
+
+
+_FUNCS = {
+    "SMA": _do_sma,
+    "EMA": _do_ema,
+    "RSI": _do_rsi,
+    "SHIFT": _do_shift,
+}
+
+# Multi-output indicators: each name selects one line of a shared computation,
+# so e.g. MACD(close) and MACD_SIGNAL(close) compute the EMAs only once.
+# MACD(...) is the MACD line and BBANDS(...) the middle band.
+_LINE_FUNCS = {
+    "MACD": (_macd_lines, 0),
+    "MACD_SIGNAL": (_macd_lines, 1),
+    "MACD_HIST": (_macd_lines, 2),
+    "BBUPPER": (_bb_lines, 0),
+    "BBANDS": (_bb_lines, 1),
+    "BBLOWER": (_bb_lines, 2),
+}
+
+# Every accepted (FUNCTION, arity) pair, so a call is checked with one set lookup;
+# validate_indicator only runs to build the error for a call that fails it
+_VALID_CALLS = frozenset(
+    (name.upper(), argc) for name, arities in ALLOWED_INDICATORS.items() for argc in arities
+)
+
+# Arithmetic and comparison operators; NumPy broadcasts scalar/array combinations
+_BINOPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
 
+# Elementwise subtrees (arithmetic, comparisons, AND/OR/NOT) are fused into one
+# numexpr call on frames at least this long; below it NumPy temporaries stay
+# cache-resident and the numexpr setup cost dominates.
+_NUMEXPR_MIN_ROWS = 100_000
+_NUMEXPR_ARITH = ("+", "-", "*", "/")
+_NUMEXPR_COMPARE = (">", "<", ">=", "<=", "==", "!=")
+_NUMEXPR_LOGIC = {"AND": "&", "OR": "|"}
+
+
+def _is_fusible(node: ASTNode) -> bool:
+    if isinstance(node, BinaryOp):
+        op = node.op.upper()
+        return op in _NUMEXPR_ARITH or op in _NUMEXPR_COMPARE or op in _NUMEXPR_LOGIC
+    return isinstance(node, UnaryOp) and node.op.upper() == "NOT"
+
+
+# ----- Static typing for AND/OR short-circuiting -----
+# Kinds: "farray" (float series), "barray" (bool series), "float"/"bool"
+# (scalars), or None when evaluation could raise. Only subtrees that provably
+# evaluate cleanly may be skipped, so short-circuiting never hides an error.
+_BOOL_KINDS = ("barray", "bool")
+_FLOAT_KINDS = ("farray", "float")
+
+
+def _static_kind(node: ASTNode) -> Optional[str]:
     if isinstance(node, Literal):
-        return node.value
+        return "bool" if isinstance(node.value, bool) else "float"
 
     if isinstance(node, SeriesRef):
-        series = df[node.name]
-        if node.lag > 0:
-            series = series.shift(node.lag)
-        return series
+        return "farray" if node.name in VALID_SERIES else None
 
     if isinstance(node, FuncCall):
-        func_name = node.name.upper()
-        args = [eval_ast(arg, df) for arg in node.args]
-        # Optional runtime validation to fail fast on unknown indicator names
-        try:
-            from .validator import validate_indicator  # type: ignore
-            validate_indicator(func_name.lower(), len(node.args))
-        except Exception:
-            # If validator isn't available (script mode), continue
-            pass
-
-        if func_name in ("SMA", "EMA", "RSI", "SHIFT", "MACD", "BBANDS", "BBUPPER", "BBLOWER", "MACD_SIGNAL", "MACD_HIST", "CROSSOVER", "CROSSUNDER"):
-            pass  # placeholder to keep grouping nearby
-        
-        if func_name == "SMA":
-            if len(args) != 2:
-                raise ValueError("SMA(series, window) expects 2 arguments")
-            series, window = args[0], int(args[1])
-            if not isinstance(series, pd.Series):
-                raise TypeError("SMA first argument must be a Series")
-            return sma(series, window)
-
-        if func_name == "RSI":
-            if len(args) != 2:
-                raise ValueError("RSI(series, window) expects 2 arguments")
-            series, window = args[0], int(args[1])
-            if not isinstance(series, pd.Series):
-                raise TypeError("RSI first argument must be a Series")
-            return rsi(series, window)
-
-        if func_name == "EMA":
-            if len(args) != 2:
-                raise ValueError("EMA(series, window) expects 2 arguments")
-            series, window = args[0], int(args[1])
-            if not isinstance(series, pd.Series):
-                raise TypeError("EMA first argument must be a Series")
-            return ema(series, window)
-
-        if func_name == "SHIFT":
-            if len(args) != 2:
-                raise ValueError("SHIFT(series, lag) expects 2 arguments")
-            series, lag = args[0], int(args[1])
-            if not isinstance(series, pd.Series):
-                raise TypeError("SHIFT first argument must be a Series")
-            return series.shift(lag)
-
-        if func_name == "MACD":
-            # MACD(series, fast=12, slow=26, signal=9) → returns macd_line
-            # To use signal or histogram, users can construct via auxiliary functions in future.
-            # For now, expose the macd line directly when called.
-            if len(args) < 1 or len(args) > 4:
-                raise ValueError("MACD(series, fast=12, slow=26, signal=9) expects 1-4 arguments")
-            series = args[0]
-            if not isinstance(series, pd.Series):
-                raise TypeError("MACD first argument must be a Series")
-            fast = int(args[1]) if len(args) >= 2 else 12
-            slow = int(args[2]) if len(args) >= 3 else 26
-            signal = int(args[3]) if len(args) >= 4 else 9
-            macd_line, _signal_line, _hist = macd(series, fast=fast, slow=slow, signal=signal)
-            return macd_line
-
-        if func_name == "BBANDS":
-            # BBANDS(series, period=20, std=2.0) → returns middle band for direct comparisons
-            # To use upper/lower explicitly, add functions BBUPPER/BBLOWER in future.
-            if len(args) < 1 or len(args) > 3:
-                raise ValueError("BBANDS(series, period=20, std=2.0) expects 1-3 arguments")
-            series = args[0]
-            if not isinstance(series, pd.Series):
-                raise TypeError("BBANDS first argument must be a Series")
-            period = int(args[1]) if len(args) >= 2 else 20
-            std = float(args[2]) if len(args) >= 3 else 2.0
-            _upper, middle, _lower = bbands(series, period=period, std=std)
-            return middle
-
-        if func_name == "BBUPPER":
-            if len(args) < 1 or len(args) > 3:
-                raise ValueError("BBUPPER(series, period=20, std=2.0) expects 1-3 arguments")
-            series = args[0]
-            if not isinstance(series, pd.Series):
-                raise TypeError("BBUPPER first argument must be a Series")
-            period = int(args[1]) if len(args) >= 2 else 20
-            std = float(args[2]) if len(args) >= 3 else 2.0
-            return bbupper(series, period=period, std=std)
-
-        if func_name == "BBLOWER":
-            if len(args) < 1 or len(args) > 3:
-                raise ValueError("BBLOWER(series, period=20, std=2.0) expects 1-3 arguments")
-            series = args[0]
-            if not isinstance(series, pd.Series):
-                raise TypeError("BBLOWER first argument must be a Series")
-            period = int(args[1]) if len(args) >= 2 else 20
-            std = float(args[2]) if len(args) >= 3 else 2.0
-            return bblower(series, period=period, std=std)
-
-        if func_name == "MACD_SIGNAL":
-            if len(args) < 1 or len(args) > 4:
-                raise ValueError("MACD_SIGNAL(series, fast=12, slow=26, signal=9) expects 1-4 arguments")
-            series = args[0]
-            if not isinstance(series, pd.Series):
-                raise TypeError("MACD_SIGNAL first argument must be a Series")
-            fast = int(args[1]) if len(args) >= 2 else 12
-            slow = int(args[2]) if len(args) >= 3 else 26
-            signal = int(args[3]) if len(args) >= 4 else 9
-            return macd_signal(series, fast=fast, slow=slow, signal=signal)
-
-        if func_name == "MACD_HIST":
-            if len(args) < 1 or len(args) > 4:
-                raise ValueError("MACD_HIST(series, fast=12, slow=26, signal=9) expects 1-4 arguments")
-            series = args[0]
-            if not isinstance(series, pd.Series):
-                raise TypeError("MACD_HIST first argument must be a Series")
-            fast = int(args[1]) if len(args) >= 2 else 12
-            slow = int(args[2]) if len(args) >= 3 else 26
-            signal = int(args[3]) if len(args) >= 4 else 9
-            return macd_hist(series, fast=fast, slow=slow, signal=signal)
-
-        if func_name in ("CROSSOVER", "CROSSUNDER"):
-            if len(args) != 2:
-                raise ValueError(f"{func_name}(seriesA, seriesB) expects 2 arguments")
-            left, right = args
-            if not isinstance(left, pd.Series) or not isinstance(right, pd.Series):
-                raise TypeError(f"{func_name} operands must be pandas Series")
-            if func_name == "CROSSOVER":
-                return (left > right) & (left.shift(1) <= right.shift(1))
+        name = node.name.upper()
+        if (name, len(node.args)) not in _VALID_CALLS:
+            return None
+        kinds = [_static_kind(arg) for arg in node.args]
+        if name in ("CROSSOVER", "CROSSUNDER"):
+            return "barray" if all(k in ("farray", "barray") for k in kinds) else None
+        if (name not in _FUNCS and name not in _LINE_FUNCS) or kinds[0] != "farray":
+            return None
+        # Window/span parameters: plain literals that every indicator accepts
+        for arg in node.args[1:]:
+            if not isinstance(arg, Literal) or not arg.value >= 1:
+                return None
+        return "farray"
+
+    if isinstance(node, UnaryOp):
+        kind = _static_kind(node.operand)
+        if node.op.upper() != "NOT" or kind in (None, "farray"):
+            return None
+        return "barray" if kind == "barray" else "bool"
+
+    if isinstance(node, BinaryOp):
+        op = node.op.upper()
+        left, right = _static_kind(node.left), _static_kind(node.right)
+        if op in ("AND", "OR"):
+            return "barray" if left in _BOOL_KINDS and right in _BOOL_KINDS else None
+        if left not in _FLOAT_KINDS or right not in _FLOAT_KINDS:
+            return None
+        if op in ("CROSSOVER", "CROSSUNDER"):
+            # _cross rejects scalar operands
+            return "barray" if left == "farray" and right == "farray" else None
+        scalar = left == "float" and right == "float"
+        if op in _NUMEXPR_COMPARE:
+            return "bool" if scalar else "barray"
+        if op in _NUMEXPR_ARITH:
+            # Python scalar division can raise ZeroDivisionError
+            return None if scalar and op == "/" else ("float" if scalar else "farray")
+    return None
+
+
+def _columns_of(node: ASTNode, out: set) -> set:
+    if isinstance(node, SeriesRef):
+        out.add(node.name)
+    elif isinstance(node, FuncCall):
+        for arg in node.args:
+            _columns_of(arg, out)
+    elif isinstance(node, UnaryOp):
+        _columns_of(node.operand, out)
+    elif isinstance(node, BinaryOp):
+        _columns_of(node.left, out)
+        _columns_of(node.right, out)
+    return out
+
+
+def _call_count(node: ASTNode) -> int:
+    """Rough evaluation cost: number of function calls in the subtree."""
+    if isinstance(node, FuncCall):
+        return 1 + sum(_call_count(arg) for arg in node.args)
+    if isinstance(node, UnaryOp):
+        return _call_count(node.operand)
+    if isinstance(node, BinaryOp):
+        return _call_count(node.left) + _call_count(node.right)
+    return 0
+
+
+def _flatten_chain(node: ASTNode, op: str) -> list:
+    """Operands of a left-nested ``op`` chain (AND/OR), in evaluation order."""
+    operands = []
+    while isinstance(node, BinaryOp) and node.op.upper() == op:
+        operands.append(node.right)
+        node = node.left
+    operands.append(node)
+    operands.reverse()
+    return operands
+
+
+def _has_series(node: ASTNode) -> bool:
+    """True if the subtree reads market data (i.e. evaluates to an array)."""
+    if isinstance(node, (SeriesRef, FuncCall)):
+        return True
+    if isinstance(node, UnaryOp):
+        return _has_series(node.operand)
+    if isinstance(node, BinaryOp):
+        return _has_series(node.left) or _has_series(node.right)
+    return False
+
+
+class Evaluator:
+    """
+    Runtime state for evaluating compiled AST closures over one set of columns.
+
+    Each column is converted to a float64 array the first time an expression
+    references it and reused afterwards; columns a strategy never mentions are
+    never copied. Results are memoized by structural AST key, so a subtree
+    shared between expressions (or between a strategy's entry and exit) is
+    evaluated once.
+    """
+
+    def __init__(self, df: pd.DataFrame, cache: Optional[Dict[Hashable, object]] = None):
+        self.index = df.index
+        self.n = len(df)
+        self._df = df
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.cache: Dict[Hashable, object] = {} if cache is None else cache
+
+    @classmethod
+    def from_arrays(
+        cls, cols: Dict[str, np.ndarray], cache: Optional[Dict[Hashable, object]] = None
+    ) -> "Evaluator":
+        """Build an evaluator over pre-extracted column arrays (no DataFrame)."""
+        self = cls.__new__(cls)
+        self.index = None
+        self._df = None
+        self.arrays = {name: np.asarray(arr, dtype=np.float64) for name, arr in cols.items()}
+        self.n = len(next(iter(self.arrays.values()))) if self.arrays else 0
+        self.cache = {} if cache is None else cache
+        return self
+
+    def evaluate(self, node: ASTNode) -> Union[np.ndarray, float, bool]:
+        """Evaluate a node to an ndarray (series expressions) or a scalar (literals)."""
+        if isinstance(node, Literal):
+            return node.value
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _compiled(node)(self)
+
+    # ----- numexpr fusion -----
+
+    def _fuse(self, node: ASTNode) -> Optional[np.ndarray]:
+        """
+        Evaluate an elementwise subtree in a single numexpr pass.
+
+        Indicator calls, series references and cross events are evaluated
+        normally and passed in as named arrays. Returns None when the subtree
+        can't be fused with identical semantics (e.g. arithmetic on booleans,
+        AND on a float); the caller then falls back to node-by-node NumPy, which
+        also raises the usual errors.
+        """
+        inputs: Dict[str, np.ndarray] = {}
+        compiled = self._numexpr_source(node, inputs)
+        if compiled is None:
+            return None
+        source, _kind, is_const, n_ops = compiled
+        if is_const or n_ops < 2:
+            return None
+        return numexpr.evaluate(source, local_dict=inputs)
+
+    def _numexpr_source(self, node: ASTNode, inputs: Dict[str, np.ndarray]):
+        """Return (source, kind, is_const, n_ops) for node, kind being 'f' or 'b'; None if not fusible."""
+        if isinstance(node, Literal):
+            return self._numexpr_const(node)
+
+        if _is_fusible(node):
+            if isinstance(node, UnaryOp):
+                operand = self._numexpr_source(node.operand, inputs)
+                if operand is None:
+                    return None
+                if operand[2]:
+                    return self._numexpr_const(node)
+                if operand[1] != "b":
+                    return None
+                return f"(~{operand[0]})", "b", False, operand[3] + 1
+
+            op = node.op.upper()
+            left = self._numexpr_source(node.left, inputs)
+            right = self._numexpr_source(node.right, inputs)
+            if left is None or right is None:
+                return None
+            if left[2] and right[2]:
+                return self._numexpr_const(node)
+            if op in _NUMEXPR_LOGIC:
+                if left[1] != "b" or right[1] != "b":
+                    return None
+                symbol, kind = _NUMEXPR_LOGIC[op], "b"
             else:
-                return (left < right) & (left.shift(1) >= right.shift(1))
-        
-        # If we get here, the function name wasn't recognized above
-        raise ValueError(f"Unknown function: {func_name}")
+                if left[1] != "f" or right[1] != "f":
+                    return None
+                symbol, kind = op, ("f" if op in _NUMEXPR_ARITH else "b")
+            return f"({left[0]} {symbol} {right[0]})", kind, False, left[3] + right[3] + 1
+
+        # Anything else is an input array computed the usual way
+        value = self.evaluate(node)
+        if not isinstance(value, np.ndarray):
+            return None
+        if value.dtype == np.bool_:
+            kind = "b"
+        elif value.dtype == np.float64:
+            kind = "f"
+        else:
+            return None
+        name = f"v{len(inputs)}"
+        inputs[name] = value
+        return name, kind, False, 0
+
+    def _numexpr_const(self, node: ASTNode):
+        """Evaluate a scalar-only subtree with Python semantics and inline the result."""
+        value = self.evaluate(node)
+        if isinstance(value, bool):
+            return repr(value), "b", True, 0
+        if isinstance(value, float) and np.isfinite(value):
+            return f"({value!r})", "f", True, 0
+        return None
+
+    def _column(self, name: str) -> np.ndarray:
+        arr = self.arrays.get(name)
+        if arr is None:
+            if self._df is None or name not in VALID_SERIES:
+                raise KeyError(name)
+            arr = self._df[name].to_numpy(dtype=np.float64)
+            self.arrays[name] = arr
+        return arr
+
+    def _has_columns(self, names) -> bool:
+        if self._df is None:
+            return all(name in self.arrays for name in names)
+        return all(name in self.arrays or name in self._df.columns for name in names)
+
+    def _broadcast_bool(self, value) -> np.ndarray:
+        return np.full(self.n, value, dtype=bool)
+
+
+# ----- AST → closure compilation -----
+# Each node compiles once to a closure taking an Evaluator. Dispatch on node
+# type, operator lookups and structural keys all happen at compile time; at run
+# time a closure only fetches its children's arrays and applies one NumPy op.
+
+
+def _compile(node: ASTNode, keys: Dict[int, Hashable]):
+    """Compile a node to ``fn(evaluator)``, memoized through evaluator.cache."""
+    if isinstance(node, Literal):
+        value = node.value
+        return lambda ev: value
+
+    raw = _compile_node(node, keys)
+    key = _ast_key(node, keys)
+    fusible = _is_fusible(node) and _has_series(node)
+
+    def run(ev):
+        cache = ev.cache
+        if key in cache:
+            return cache[key]
+        result = None
+        if fusible and HAS_NUMEXPR and ev.n >= _NUMEXPR_MIN_ROWS:
+            result = ev._fuse(node)
+        if result is None:
+            result = raw(ev)
+        cache[key] = result
+        return result
+
+    return run
+
+
+def _compile_node(node: ASTNode, keys: Dict[int, Hashable]):
+    # ----- Leaf nodes -----
+
+    if isinstance(node, SeriesRef):
+        name, lag = node.name, node.lag
+        return lambda ev: _lag(ev._column(name), lag)
+
+    if isinstance(node, FuncCall):
+        func_name = node.name.upper()
+        lower_name = func_name.lower()
+        argc = len(node.args)
+        arg_fns = tuple(_compile(arg, keys) for arg in node.args)
+        handler = _FUNCS.get(func_name)
+        line = _LINE_FUNCS.get(func_name)
+        series_key = _ast_key(node.args[0], keys) if line is not None and node.args else None
+        valid = (func_name, argc) in _VALID_CALLS
+        is_cross = func_name in ("CROSSOVER", "CROSSUNDER")
+
+        def call(ev):
+            # Fail fast on unknown indicator names/arities before evaluating arguments
+            if not valid:
+                validate_indicator(lower_name, argc)
+            args = [fn(ev) for fn in arg_fns]
+
+            if is_cross:
+                if len(args) != 2:
+                    raise ValueError(f"{func_name}(seriesA, seriesB) expects 2 arguments")
+                left, right = args
+                return _cross(func_name, left, right)
+
+            if handler is not None:
+                return handler(args)
+
+            if line is not None:
+                lines_fn, index = line
+                return lines_fn(func_name, args, ev.cache, series_key)[index]
+
+            # If we get here, the function name wasn't recognized above
+            raise ValueError(f"Unknown function: {func_name}")
+
+        return call
 
     # ----- Unary ops -----
 
     if isinstance(node, UnaryOp):
-        operand = eval_ast(node.operand, df)
+        operand_fn = _compile(node.operand, keys)
         op = node.op.upper()
 
         if op == "NOT":
-            # Expect boolean Series
-            if isinstance(operand, pd.Series):
-                return ~operand
-            return not bool(operand)
+            def negate(ev):
+                operand = operand_fn(ev)
+                # Expect boolean array
+                if isinstance(operand, np.ndarray):
+                    return ~operand
+                return not bool(operand)
+
+            return negate
+
+        def unknown_unary(ev):
+            operand_fn(ev)
+            raise ValueError(f"Unknown unary op: {op}")
 
-        raise ValueError(f"Unknown unary op: {op}")
+        return unknown_unary
 
     # ----- Binary ops -----
 
     if isinstance(node, BinaryOp):
         op = node.op.upper()
 
-        # Short-circuit AND/OR with Series support
         if op in ("AND", "OR"):
-            left = eval_ast(node.left, df)
-            right = eval_ast(node.right, df)
-
-            # Optional scalar broadcasting for convenience
-            if isinstance(left, bool):
-                left = pd.Series([left] * len(df), index=df.index)
-            if isinstance(right, bool):
-                right = pd.Series([right] * len(df), index=df.index)
-
-            if not isinstance(left, pd.Series) or not isinstance(right, pd.Series):
-                raise TypeError("AND/OR operands must be pandas Series or booleans")
-
-            if op == "AND":
-                return left & right
-            else:  # "OR"
-                return left | right
-
-        # Arithmetic or comparison or cross event
-        left = eval_ast(node.left, df)
-        right = eval_ast(node.right, df)
-
-        # Arithmetic operators
-        if op == "+":
-            return left + right
-        if op == "-":
-            return left - right
-        if op == "*":
-            return left * right
-        if op == "/":
-            return left / right
-
-        # Comparisons
-        if op in (">", "<", ">=", "<=", "==", "!="):
-            return _compare(left, right, op)
-
-        # Cross events: expect Series on both sides
-        if op == "CROSSOVER":
-            if not isinstance(left, pd.Series) or not isinstance(right, pd.Series):
-                raise TypeError("CROSSOVER operands must be pandas Series")
-            return (left > right) & (left.shift(1) <= right.shift(1))
-
-        if op == "CROSSUNDER":
-            if not isinstance(left, pd.Series) or not isinstance(right, pd.Series):
-                raise TypeError("CROSSUNDER operands must be pandas Series")
-            return (left < right) & (left.shift(1) >= right.shift(1))
-
-        raise ValueError(f"Unknown binary op: {op}")
-
-    raise ValueError(f"Unknown AST node type: {type(node)}")
-
-
-def _compare(left, right, op: str):
+            # A AND B AND C parses as ((A AND B) AND C); evaluate the whole
+            # chain into one output buffer instead of one array per pair.
+            operands = _flatten_chain(node, op)
+            reduce_into = np.bitwise_and if op == "AND" else np.bitwise_or
+            # When no operand can raise, evaluate the cheaper ones first and
+            # skip the rest once the running result decides every bar.
+            safe = all(_static_kind(operand) in _BOOL_KINDS for operand in operands)
+            columns = frozenset(_columns_of(node, set())) if safe else frozenset()
+            if safe:
+                operands = sorted(operands, key=_call_count)
+            operand_fns = tuple(_compile(operand, keys) for operand in operands)
+
+            def logical(ev):
+                check = safe and ev._has_columns(columns)
+                result = None
+                for i, fn in enumerate(operand_fns):
+                    value = fn(ev)
+                    # Optional scalar broadcasting for convenience
+                    if isinstance(value, bool):
+                        value = ev._broadcast_bool(value)
+                    if i == 0:
+                        result = value
+                    else:
+                        if not isinstance(result, np.ndarray) or not isinstance(value, np.ndarray):
+                            raise TypeError("AND/OR operands must be pandas Series or booleans")
+                        # The first operand may be a cached array: never write into it
+                        result = reduce_into(result, value, out=None if i == 1 else result)
+                    if check and isinstance(result, np.ndarray):
+                        if op == "AND" and not result.any():
+                            return np.zeros(ev.n, dtype=bool)
+                        if op == "OR" and result.all():
+                            return np.ones(ev.n, dtype=bool)
+                return result
+
+            return logical
+
+        left_fn = _compile(node.left, keys)
+        right_fn = _compile(node.right, keys)
+
+        # Arithmetic operators and comparisons
+        binop = _BINOPS.get(op)
+        if binop is not None:
+            if op in _NUMEXPR_COMPARE:
+                lagged = _compile_lagged_compare(node, binop, left_fn, right_fn)
+                if lagged is not None:
+                    return lagged
+            return lambda ev: binop(left_fn(ev), right_fn(ev))
+
+        # Cross events: expect series on both sides
+        if op in ("CROSSOVER", "CROSSUNDER"):
+            return lambda ev: _cross(op, left_fn(ev), right_fn(ev))
+
+        def unknown_binary(ev):
+            left_fn(ev)
+            right_fn(ev)
+            raise ValueError(f"Unknown binary op: {op}")
+
+        return unknown_binary
+
+    def unknown_node(ev):
+        raise ValueError(f"Unknown AST node type: {type(node)}")
+
+    return unknown_node
+
+
+@lru_cache(maxsize=128)
+def _compile_cached(node: ASTNode):
+    return _compile(node, {})
+
+
+def _compiled(node: ASTNode):
+    """
+    Compiled closure for node, shared by all structurally equal ASTs.
+
+    AST nodes are frozen dataclasses, so they hash and compare by structure;
+    re-running the same strategy (or re-parsing the same text) reuses the
+    closures compiled the first time.
+    """
+    try:
+        return _compile_cached(node)
+    except TypeError:  # hand-built node holding an unhashable value
+        return _compile(node, {})
+
+
+def _compile_lagged_compare(node: BinaryOp, binop, left_fn, right_fn):
+    """
+    Compare against a lagged column (e.g. ``high > high[1]``) without building
+    the shifted copy: the comparison reads an offset slice of the column.
+
+    The first ``lag`` bars compare against NaN, so they are False (True for !=).
+    Returns None when neither operand is a lagged series reference.
+    """
+    if isinstance(node.right, SeriesRef) and node.right.lag > 0:
+        ref, other_fn, ref_on_right = node.right, left_fn, True
+    elif isinstance(node.left, SeriesRef) and node.left.lag > 0:
+        ref, other_fn, ref_on_right = node.left, right_fn, False
+    else:
+        return None
+    name, k = ref.name, ref.lag
+    fill = node.op == "!="
+
+    def compare(ev):
+        # Operands evaluate in source order, as in the unfused path
+        if ref_on_right:
+            other = other_fn(ev)
+            col = ev._column(name)
+        else:
+            col = ev._column(name)
+            other = other_fn(ev)
+        n = ev.n
+        out = np.full(n, fill, dtype=bool)
+        if k >= n:
+            return out
+        if isinstance(other, np.ndarray):
+            other = other[k:]
+        lagged = col[: n - k]
+        out[k:] = binop(other, lagged) if ref_on_right else binop(lagged, other)
+        return out
+
+    return compare
+
+
+# ----- AST → tape (Numba interpreter) -----
+# With Numba installed, a strategy whose types check statically (so evaluation
+# can't raise) is flattened to instruction arrays and run by
+# _kernels.eval_tape in one native call. Anything else (MACD/BB lines, scalar
+# AND, ...) goes through the closure evaluator above.
+
+_TAPE_BINOPS = {
+    "+": _kernels.OP_ADD,
+    "-": _kernels.OP_SUB,
+    "*": _kernels.OP_MUL,
+    "/": _kernels.OP_DIV,
+    ">": _kernels.OP_GT,
+    "<": _kernels.OP_LT,
+    ">=": _kernels.OP_GE,
+    "<=": _kernels.OP_LE,
+    "==": _kernels.OP_EQ,
+    "!=": _kernels.OP_NE,
+    "AND": _kernels.OP_AND,
+    "OR": _kernels.OP_OR,
+    "CROSSOVER": _kernels.OP_CROSSOVER,
+    "CROSSUNDER": _kernels.OP_CROSSUNDER,
+}
+
+_TAPE_FUNCS = {
+    "SMA": _kernels.OP_SMA,
+    "EMA": _kernels.OP_EMA,
+    "RSI": _kernels.OP_RSI,
+    "SHIFT": _kernels.OP_SHIFT,
+    "CROSSOVER": _kernels.OP_CROSSOVER,
+    "CROSSUNDER": _kernels.OP_CROSSUNDER,
+}
+
+
+def ast_to_tape(*nodes: ASTNode):
+    """
+    Flatten expressions into one post-order instruction tape.
+
+    Structurally identical subtrees share a slot, so they are computed once.
+
+    Parameters
+    ----------
+    *nodes : ASTNode
+        Root expressions, e.g. a strategy's entry and exit.
+
+    Returns
+    -------
+    tuple or None
+        ``(opcodes, lefts, rights, iargs, fargs, name_ids, names, roots)``:
+        per-instruction arrays, the column names ``name_ids`` index into, and
+        the slot holding each root. None if an expression uses something the
+        tape can't represent or could raise at evaluation time.
+    """
+    if any(_static_kind(node) is None for node in nodes):
+        return None
+
+    code = []  # rows of (opcode, left, right, iarg, farg, name_id)
+    names: Dict[str, int] = {}
+    slots: Dict[Hashable, int] = {}
+    keys: Dict[int, Hashable] = {}
+
+    def emit(node: ASTNode) -> Optional[int]:
+        key = _ast_key(node, keys)
+        slot = slots.get(key)
+        if slot is not None:
+            return slot
+
+        if isinstance(node, Literal):
+            row = (_kernels.OP_CONST, 0, 0, 0, float(node.value), 0)
+        elif isinstance(node, SeriesRef):
+            name_id = names.setdefault(node.name, len(names))
+            row = (_kernels.OP_COLUMN, 0, 0, node.lag, 0.0, name_id)
+        elif isinstance(node, FuncCall):
+            opcode = _TAPE_FUNCS.get(node.name.upper())
+            if opcode is None:
+                return None
+            left = emit(node.args[0])
+            if left is None:
+                return None
+            if opcode in (_kernels.OP_CROSSOVER, _kernels.OP_CROSSUNDER):
+                right = emit(node.args[1])
+                if right is None:
+                    return None
+                row = (opcode, left, right, 0, 0.0, 0)
+            else:
+                row = (opcode, left, 0, int(node.args[1].value), 0.0, 0)
+        elif isinstance(node, UnaryOp):
+            operand = emit(node.operand)
+            if operand is None:
+                return None
+            row = (_kernels.OP_NOT, operand, 0, 0, 0.0, 0)
+        elif isinstance(node, BinaryOp):
+            opcode = _TAPE_BINOPS.get(node.op.upper())
+            if opcode is None:
+                return None
+            left = emit(node.left)
+            right = emit(node.right)
+            if left is None or right is None:
+                return None
+            row = (opcode, left, right, 0, 0.0, 0)
+        else:
+            return None
+
+        slots[key] = slot = len(code)
+        code.append(row)
+        return slot
+
+    roots = [emit(node) for node in nodes]
+    if any(root is None for root in roots):
+        return None
+
+    opcodes, lefts, rights, iargs, fargs, name_ids = zip(*code)
+    return (
+        np.array(opcodes, dtype=np.int64),
+        np.array(lefts, dtype=np.int64),
+        np.array(rights, dtype=np.int64),
+        np.array(iargs, dtype=np.int64),
+        np.array(fargs, dtype=np.float64),
+        np.array(name_ids, dtype=np.int64),
+        tuple(names),
+        np.array(roots, dtype=np.int64),
+    )
+
+
+@lru_cache(maxsize=128)
+def _strategy_tape_cached(entry: ASTNode, exit_: ASTNode):
+    return ast_to_tape(entry, exit_)
+
+
+def _run_tape(strategy: Strategy, df: pd.DataFrame) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Entry/exit bool arrays from the tape interpreter, or None to use the evaluator."""
+    try:
+        tape = _strategy_tape_cached(strategy.entry, strategy.exit)
+    except TypeError:  # hand-built node holding an unhashable value
+        tape = ast_to_tape(strategy.entry, strategy.exit)
+    if tape is None:
+        return None
+    *program, names, roots = tape
+    # A missing column is left to the evaluator, which raises the usual KeyError
+    if not all(name in df.columns for name in names):
+        return None
+    columns = np.empty((len(names), len(df)), dtype=np.float64)
+    for i, name in enumerate(names):
+        columns[i] = df[name].to_numpy(dtype=np.float64)
+    entry, exit_ = _kernels.eval_tape(*program, columns, roots)
+    return entry, exit_
+
+
+def compile_ast(node: ASTNode):
+    """
+    Compile an AST node once into a callable over column arrays.
+
+    Compiled callables are cached (LRU, 128 entries) by AST structure.
+
+    Parameters
+    ----------
+    node : ASTNode
+        AST node to compile.
+
+    Returns
+    -------
+    Callable[[Dict[str, np.ndarray]], Union[np.ndarray, float, bool]]
+        ``fn(cols, cache=None)`` evaluating the node over a dict of column
+        arrays (e.g. ``{'close': ..., 'volume': ...}``). Pass the same
+        ``cache`` dict across calls over the same columns to share
+        intermediate results.
+    """
+    fn = _compiled(node)
+
+    def evaluate(cols: Dict[str, np.ndarray], cache: Optional[Dict[Hashable, object]] = None):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return fn(Evaluator.from_arrays(cols, cache))
+
+    return evaluate
+
+
+def _windowed_calls(node: ASTNode, found: set) -> None:
+    if isinstance(node, FuncCall):
+        name = node.name.upper()
+        if name in ("SMA", "EMA", "RSI") and len(node.args) == 2 and isinstance(node.args[1], Literal):
+            found.add((name, int(node.args[1].value)))
+        for arg in node.args:
+            _windowed_calls(arg, found)
+    elif isinstance(node, UnaryOp):
+        _windowed_calls(node.operand, found)
+    elif isinstance(node, BinaryOp):
+        _windowed_calls(node.left, found)
+        _windowed_calls(node.right, found)
+
+
+def strategy_compile(strategy: Strategy) -> Dict[tuple, object]:
+    """
+    Compile the window-specialized indicator kernels a strategy needs.
+
+    Collects every SMA/EMA/RSI call with a literal window and builds (and
+    JIT-compiles) one Numba kernel per (indicator, window) pair. Kernels live in
+    a process-wide cache that generate_signals picks up, so calling this once
+    before replaying a strategy over many frames moves all compilation up front.
+
+    Parameters
+    ----------
+    strategy : Strategy
+        Parsed strategy AST.
+
+    Returns
+    -------
+    dict
+        Mapping of (indicator, window) to its compiled kernel. Empty when
+        numba is not installed (generate_signals then uses the pandas
+        indicators).
+    """
+    found: set = set()
+    _windowed_calls(strategy.entry, found)
+    _windowed_calls(strategy.exit, found)
+    kernels: Dict[tuple, object] = {}
+    if not HAS_NUMBA:
+        return kernels
+    warmup = np.empty(0, dtype=np.float64)
+    for name, window in sorted(found):
+        if window < 1:
+            continue
+        kernel = specialized_kernel(name, window)
+        kernel(warmup)
+        kernels[(name, window)] = kernel
+    return kernels
+
+
+def eval_ast(
+    node: ASTNode,
+    df: pd.DataFrame,
+    cache: Optional[Dict[Hashable, object]] = None,
+) -> Union[pd.Series, float, bool]:
     """
-    Helper for comparison operations.
-    Supports scalar/Series combinations via pandas broadcasting.
+    Evaluate an AST node over a pandas DataFrame.
+
+    Depending on the node, this can return:
+    - A scalar (float/bool) for literals
+    - A pandas Series for time-series expressions
+    - A boolean Series for boolean expressions/comparisons
+
+    Parameters
+    ----------
+    node : ASTNode
+        AST node to evaluate.
+    df : pd.DataFrame
+        Input OHLCV data. Must contain columns like 'open', 'high',
+        'low', 'close', 'volume'.
+    cache : dict, optional
+        Intermediate ndarray results keyed by structural AST key. Pass the same
+        dict across calls over the same ``df`` to evaluate each distinct
+        subtree only once.
+
+    Returns
+    -------
+    Union[pd.Series, float, bool]
+        Result of the evaluation.
     """
-    if op == ">":
-        return left > right
-    if op == "<":
-        return left < right
-    if op == ">=":
-        return left >= right
-    if op == "<=":
-        return left <= right
-    if op == "==":
-        return left == right
-    if op == "!=":
-        return left != right
-    raise ValueError(f"Unsupported comparison op: {op}")
+    result = Evaluator(df, cache).evaluate(node)
+    if isinstance(result, np.ndarray):
+        return pd.Series(result, index=df.index, copy=False)
+    return result
 
 
 def generate_signals(strategy: Strategy, df: pd.DataFrame) -> pd.DataFrame:
@@ -313,22 +1018,34 @@ def generate_signals(strategy: Strategy, df: pd.DataFrame) -> pd.DataFrame:
         - 'entry': True where entry condition is satisfied.
         - 'exit':  True where exit condition is satisfied.
     """
-    entry_raw = eval_ast(strategy.entry, df)
-    exit_raw = eval_ast(strategy.exit, df)
+    if HAS_NUMBA:
+        compiled = _run_tape(strategy, df)
+        if compiled is not None:
+            entry, exit_ = compiled
+            return pd.DataFrame({"entry": entry, "exit": exit_}, index=df.index, copy=False)
 
-    # Coerce scalars to Series if needed (rare, but for completeness)
-    if not isinstance(entry_raw, pd.Series):
-        entry_series = pd.Series([bool(entry_raw)] * len(df), index=df.index)
-    else:
-        entry_series = entry_raw.astype(bool)
+    # One evaluator so subtrees common to entry and exit are computed once
+    evaluator = Evaluator(df)
+    entry_raw = evaluator.evaluate(strategy.entry)
+    exit_raw = evaluator.evaluate(strategy.exit)
+
+    # The finalized arrays are fresh or private to this call, so wrap them as-is
+    return pd.DataFrame(
+        {"entry": _finalize(entry_raw, len(df)), "exit": _finalize(exit_raw, len(df))},
+        index=df.index,
+        copy=False,
+    )
 
-    if not isinstance(exit_raw, pd.Series):
-        exit_series = pd.Series([bool(exit_raw)] * len(df), index=df.index)
-    else:
-        exit_series = exit_raw.astype(bool)
 
-    signals = pd.DataFrame(index=df.index)
-    # Ensure Python bools (not numpy.bool_) so tests using `is False/True` pass
-    signals["entry"] = entry_series.fillna(False).map(lambda x: bool(x))
-    signals["exit"] = exit_series.fillna(False).map(lambda x: bool(x))
-    return signals
+def _finalize(raw, n: int) -> np.ndarray:
+    """
+    Coerce an evaluated entry/exit expression to a length-n bool array.
+
+    Boolean results (comparisons, cross events, AND/OR) pass through without a
+    copy; scalars are broadcast. A bare numeric series is truth-tested like
+    ``Series.astype(bool)``, so NaN counts as True.
+    """
+    if isinstance(raw, np.ndarray):
+        return raw.astype(bool, copy=False)
+    # Coerce scalars to full-length arrays if needed (rare, but for completeness)
+    return np.full(n, bool(raw), dtype=bool)
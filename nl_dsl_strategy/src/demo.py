@@ -14,54 +14,30 @@ from __future__ import annotations
 
 import os
 import sys
+import numpy as np
 import pandas as pd
 import json
 from dataclasses import is_dataclass, asdict
+from functools import lru_cache
 
 # Resolve imports for both package and script execution modes
 if __package__ is None or __package__ == "":
-    # Running as a script: import modules via the package name so that
-    # their relative imports continue to work.
-    import importlib
-    # Ensure the parent of the package root is on sys.path
+    # Running as a script: make the package importable by name so that the
+    # modules' relative imports continue to work.
     _SRC_DIR = os.path.dirname(os.path.abspath(__file__))
     _PKG_ROOT = os.path.dirname(_SRC_DIR)
     _PARENT = os.path.dirname(_PKG_ROOT)
     if _PARENT not in sys.path:
         sys.path.insert(0, _PARENT)
-    _PKG = "nl_dsl_strategy.src"
-
-    nl_parser = importlib.import_module(f"{_PKG}.nl_parser")  # type: ignore
-    _dsl_mod = importlib.import_module(f"{_PKG}.dsl_lexer_parser")  # type: ignore
-    parse_dsl = getattr(_dsl_mod, "parse_dsl")  # type: ignore
-    DSLParseError = getattr(_dsl_mod, "DSLParseError")  # type: ignore
-    _codegen_mod = importlib.import_module(f"{_PKG}.codegen")  # type: ignore
-    generate_signals = getattr(_codegen_mod, "generate_signals")  # type: ignore
-    _bt_mod = importlib.import_module(f"{_PKG}.backtest")  # type: ignore
-    run_backtest = getattr(_bt_mod, "run_backtest")  # type: ignore
-else:
-        # Running as a module: use relative imports
-        from . import nl_parser               # import module, not specific function
-        from .dsl_lexer_parser import parse_dsl, DSLParseError
-        from .codegen import generate_signals
-        from .backtest import run_backtest
-
-
-# Robust imports whether run as module or script
-try:
-    from . import nl_parser, dsl_lexer_parser, codegen, backtest
-except Exception:
-    import nl_parser, dsl_lexer_parser, codegen, backtest  # type: ignore
-
-# Small embedded OHLCV sample (20 rows)
-dates = pd.date_range("2024-01-01", periods=20, freq="D")
-df = pd.DataFrame({
-    "open":  [100, 101, 102, 103, 104, 103, 102, 101, 100, 101, 102, 103, 104, 105, 104, 103, 102, 103, 104, 105],
-    "high":  [101, 102, 103, 104, 105, 104, 103, 102, 101, 102, 103, 104, 105, 106, 105, 104, 103, 104, 105, 106],
-    "low":   [99,  100, 101, 102, 103, 102, 101, 100, 99,  100, 101, 102, 103, 104, 103, 102, 101, 102, 103, 104],
-    "close": [100, 102, 101, 103, 104, 103, 102, 101, 100, 102, 103, 104, 105, 104, 103, 102, 101, 103, 104, 105],
-    "volume":[1000,1200,1100,1300,1250,1200,1150,1100,1050,1400,1500,1550,1600,1580,1570,1500,1450,1490,1520,1550],
-}, index=dates)
+
+from nl_dsl_strategy.src import nl_parser, dsl_lexer_parser, codegen, backtest
+
+# Each module is loaded exactly once, under its package name, whichever way
+# the demo is started; these are aliases, not second copies.
+parse_dsl = dsl_lexer_parser.parse_dsl
+DSLParseError = dsl_lexer_parser.DSLParseError
+generate_signals = codegen.generate_signals
+run_backtest = backtest.run_backtest
 
 examples = [
     "Buy when the close price is above the 20-day moving average and volume is above 1 million.",
@@ -121,13 +97,25 @@ def build_example_df() -> pd.DataFrame:
         ("2023-01-09", 120, 122, 119, 121, 1800000),
         ("2023-01-10", 121, 125, 120, 124, 1900000),
     ]
-    df = pd.DataFrame(
-        data,
-        columns=["date", "open", "high", "low", "close", "volume"],
-    )
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.set_index("date")
-    return df
+    # Typed column arrays and a ready-made index: no per-column dtype inference
+    # and no set_index copy. Prices are float64, which is what codegen and the
+    # backtest read them as anyway.
+    rows = list(zip(*data))
+    index = pd.DatetimeIndex(pd.to_datetime(rows[0]), name="date")
+    columns = {
+        "open": np.array(rows[1], dtype=np.float64),
+        "high": np.array(rows[2], dtype=np.float64),
+        "low": np.array(rows[3], dtype=np.float64),
+        "close": np.array(rows[4], dtype=np.float64),
+        "volume": np.array(rows[5], dtype=np.int64),
+    }
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+@lru_cache(maxsize=1)
+def get_example_df() -> pd.DataFrame:
+    """Sample OHLCV frame, built on first use and shared afterwards (treat as read-only)."""
+    return build_example_df()
 
 
 def main():
@@ -167,7 +155,7 @@ def main():
     print()
 
     # 3) AST → signals over sample data
-    df = build_example_df()
+    df = get_example_df()
     print("=== Sample OHLCV Data ===")
     print(df.head(), "\n")
 
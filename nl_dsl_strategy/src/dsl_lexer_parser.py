@@ -8,8 +8,11 @@ relative imports first and falling back to absolute imports when needed.
 
 from __future__ import annotations
 
+import difflib
 import re
+import sys
 from dataclasses import dataclass
+from functools import lru_cache
 
 # Import AST nodes with fallback for script execution
 try:  # package import
@@ -51,42 +54,60 @@ class DSLParseError(Exception):
 # Tokenizer
 # ==============
 
+# Alternatives are tried in order, so frequent tokens come first. Word tokens
+# that must win over IDENT (SUFFIX, TRUE, FALSE) stay ahead of it, and the
+# two-character comparisons stay ahead of GT/LT. PERCENT/DAY/CROSS/ABOVE/BELOW
+# follow IDENT, so of those only "%" is ever produced (as before).
 TOKEN_SPEC = [
-    ("NUMBER", r"\d+(\.\d+)?"),
     ("SUFFIX", r"\b[KkMm]\b"),
     ("TRUE", r"\bTRUE\b"),
     ("FALSE", r"\bFALSE\b"),
     ("IDENT", r"[A-Za-z_][A-Za-z0-9_]*"),
-    ("PERCENT", r"%|percent"),
-    ("DAY", r"\bday\b"),
-    ("CROSS", r"\bcross(?:es)?\b"),
-    ("ABOVE", r"\babove\b"),
-    ("BELOW", r"\bbelow\b"),
+    # A K/M multiplier separated by whitespace ("1 M") is part of the number
+    ("NUMBER", r"\d+(\.\d+)?(?:[ \t\r\n]+[KkMm]\b)?"),
+    ("LPAREN", r"\("),
+    ("RPAREN", r"\)"),
+    ("COMMA", r","),
     ("GE", r">="),
     ("LE", r"<="),
     ("EQ", r"=="),
     ("NE", r"!="),
     ("GT", r">"),
     ("LT", r"<"),
+    ("COLON", r":"),
     ("LBRACK", r"\["),
     ("RBRACK", r"\]"),
-    ("LPAREN", r"\("),
-    ("RPAREN", r"\)"),
-    ("COMMA", r","),
-    ("COLON", r":"),
     ("PLUS", r"\+"),
     ("MINUS", r"-"),
     ("TIMES", r"\*"),
     ("DIV", r"/"),
-    ("NEWLINE", r"\n"),
-    ("SKIP", r"[ \t\r]+"),
+    ("PERCENT", r"%|percent"),
+    ("DAY", r"\bday\b"),
+    ("CROSS", r"\bcross(?:es)?\b"),
+    ("ABOVE", r"\babove\b"),
+    ("BELOW", r"\bbelow\b"),
     ("MISMATCH", r"."),
 ]
 
+# Reserved words the parser dispatches on. The tokenizer gives them their own
+# token type so the parser tests one field; elsewhere they still behave (and
+# are reported) as IDENT. TRUE/FALSE are matched case-sensitively above and
+# are deliberately not promoted here.
+_KEYWORDS = frozenset({"OR", "AND", "NOT", "CROSSOVER", "CROSSUNDER", "ENTRY", "EXIT"})
+
 TOK_REGEX = "|".join("(?P<%s>%s)" % pair for pair in TOKEN_SPEC)
+# Whitespace is consumed in front of each token instead of being matched as a
+# token of its own; the lookahead keeps it from backtracking into MISMATCH.
+# The NL group ends right after the last newline in that whitespace, so it only
+# participates in matches that start a new line.
+_TOK_RE = re.compile(r"(?P<NL>[ \t\r\n]*\n)?[ \t\r]*(?![ \t\r\n])(?:%s)" % TOK_REGEX)
+
+
+# dataclass(slots=True) requires Python 3.10+; one Token is built per lexeme
+_TOKEN_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
-@dataclass
+@dataclass(**_TOKEN_OPTIONS)
 class Token:
     type: str
     value: str
@@ -97,26 +118,37 @@ class Token:
 def tokenize(code: str):
     """Convert DSL text into a list of tokens; identifiers are uppercased."""
     tokens: list[Token] = []
-    for mo in re.finditer(TOK_REGEX, code):
+    append = tokens.append
+    line = 1
+    line_start = 0
+    for mo in _TOK_RE.finditer(code):
         kind = mo.lastgroup
-        value = mo.group()
-        start = mo.start()
-        # compute line/col
-        line = code.count("\n", 0, start) + 1
-        last_newline = code.rfind("\n", 0, start)
-        col = (start - last_newline) if last_newline != -1 else (start + 1)
-        if kind == "NUMBER":
-            tokens.append(Token("NUMBER", value, line=line, col=col))
-        elif kind == "IDENT":
-            tokens.append(Token("IDENT", value.upper(), line=line, col=col))
+        value = mo.group(kind)
+        start = mo.start(kind)
+        line_end = mo.end("NL")
+        if line_end != -1:
+            line += code.count("\n", mo.start(), line_end)
+            line_start = line_end
+        if kind == "IDENT":
+            value = value.upper()
+            if value in _KEYWORDS:
+                kind = value
+        elif kind == "NUMBER" and value[-1] in "KkMm":
+            # Keep just the digits and the multiplier, e.g. "1.5M"
+            digits = value[:-1].rstrip()
+            gap = value[len(digits):-1]
+            value = digits + value[-1].upper()
+            if "\n" in gap:
+                append(Token(kind, value, line, start - line_start + 1))
+                line += gap.count("\n")
+                line_start = start + len(digits) + gap.rfind("\n") + 1
+                continue
         elif kind == "SUFFIX":
-            tokens.append(Token("SUFFIX", value.upper(), line=line, col=col))
-        elif kind in ("NEWLINE", "SKIP"):
-            continue
+            value = value.upper()
         elif kind == "MISMATCH":
+            col = start - line_start + 1
             raise DSLParseError(f"Unexpected character: {value!r}", position=start, line=line, col=col)
-        else:
-            tokens.append(Token(kind, value, line=line, col=col))
+        append(Token(kind, value, line, start - line_start + 1))
     return tokens
 
 
@@ -124,13 +156,64 @@ def tokenize(code: str):
 # Parser
 # ==============
 
+# Operator token types, built once rather than per parse call
+_OP_MAP = {
+    "GT": ">",
+    "LT": "<",
+    "GE": ">=",
+    "LE": "<=",
+    "EQ": "==",
+    "NE": "!=",
+}
+_CMP_TYPES = frozenset(_OP_MAP)
+_ADDSUB = frozenset({"PLUS", "MINUS"})
+_MULDIV = frozenset({"TIMES", "DIV"})
+_CROSS_IDENTS = frozenset({"CROSSOVER", "CROSSUNDER"})
+# End-of-input marker in Parser.types; never produced by tokenize
+_EOF = "EOF"
+
+
+# AST nodes are frozen, so the leaves that recur throughout a strategy (TRUE,
+# FALSE, common numbers, close/volume/close[1], ...) are built once and shared
+_LIT_TRUE = Literal(value=1.0)
+_LIT_FALSE = Literal(value=0.0)
+
+
+_MULTIPLIERS = {"K": 1_000.0, "M": 1_000_000.0}
+
+
+@lru_cache(maxsize=256)
+def _number_literal(text: str) -> Literal:
+    """Literal for a NUMBER token's text, applying a trailing K/M multiplier."""
+    multiplier = _MULTIPLIERS.get(text[-1])
+    if multiplier is not None:
+        return Literal(value=float(text[:-1]) * multiplier)
+    return Literal(value=float(text))
+
+
+@lru_cache(maxsize=256)
+def _series_ref(name: str, lag: int) -> SeriesRef:
+    return SeriesRef(name=name, lag=lag)
+
+
+def _base_type(tok: Token) -> str:
+    """Token type as the grammar sees it: reserved words are IDENTs."""
+    return "IDENT" if tok.type in _KEYWORDS else tok.type
+
+
 class Parser:
     """Recursive descent parser."""
 
     def __init__(self, tokens: list[Token], source_text: str | None = None):
         self.tokens = tokens
+        # Token types as a parallel list for the hot loops, plus an end marker
+        self.types = [tok.type for tok in tokens]
+        self.types.append(_EOF)
         self.pos = 0
         self.source_text = source_text or ""
+        # Unknown names without a close match are reported once the whole
+        # strategy has parsed (syntax errors take precedence), earliest first
+        self._unknown_name: tuple[int, str] | None = None
 
     def peek(self) -> Token | None:
         if self.pos < len(self.tokens):
@@ -146,33 +229,27 @@ class Parser:
         return tok
 
     def expect(self, type_: str, value: str | None = None) -> Token:
-        tok = self.peek()
-        if tok is None:
-            snippet = self._snippet()
-            raise DSLParseError(f"Expected {type_} but got EOF. Near: {snippet}")
-        if tok.type != type_:
-            ctx = []
-            for i in range(self.pos, min(self.pos + 5, len(self.tokens))):
-                t = self.tokens[i]
-                ctx.append(f"{t.type}:{t.value}")
-            snippet = self._snippet()
-            loc = f" (line {tok.line}, col {tok.col})" if tok.line is not None and tok.col is not None else ""
-            raise DSLParseError(
-                f"Expected {type_} but got {tok.type} ({tok.value}){loc}. Context: {' '.join(ctx)}. Near: {snippet}"
-            )
+        tokens = self.tokens
+        if self.pos >= len(tokens):
+            raise DSLParseError(f"Expected {type_} but got EOF. Near: {self._snippet()}")
+        tok = tokens[self.pos]
+        if tok.type != type_ and not (type_ == "IDENT" and tok.type in _KEYWORDS):
+            raise self._expect_error(tok, f"Expected {type_} but got {_base_type(tok)} ({tok.value})")
         if value is not None and tok.value != value:
-            ctx = []
-            for i in range(self.pos, min(self.pos + 5, len(self.tokens))):
-                t = self.tokens[i]
-                ctx.append(f"{t.type}:{t.value}")
-            snippet = self._snippet()
-            loc = f" (line {tok.line}, col {tok.col})" if tok.line is not None and tok.col is not None else ""
-            raise DSLParseError(
-                f"Expected {value} but got {tok.value}{loc}. Context: {' '.join(ctx)}. Near: {snippet}"
-            )
+            raise self._expect_error(tok, f"Expected {value} but got {tok.value}")
         self.pos += 1
         return tok
 
+    def _expect_error(self, tok: Token, message: str) -> DSLParseError:
+        """Build an expect() failure with location, upcoming tokens and a source snippet."""
+        ctx = []
+        for i in range(self.pos, min(self.pos + 5, len(self.tokens))):
+            t = self.tokens[i]
+            ctx.append(f"{_base_type(t)}:{t.value}")
+        snippet = self._snippet()
+        loc = f" (line {tok.line}, col {tok.col})" if tok.line is not None and tok.col is not None else ""
+        return DSLParseError(f"{message}{loc}. Context: {' '.join(ctx)}. Near: {snippet}")
+
     def _snippet(self, radius: int = 20) -> str:
         """Return a small slice of source text around an estimated position based on tokens consumed."""
         if not self.source_text:
@@ -199,42 +276,45 @@ class Parser:
 
         if self.peek() is not None:
             raise DSLParseError("Extra tokens after EXIT expression")
+        if self._unknown_name is not None:
+            raise DSLParseError(self._unknown_name[1])
 
         return Strategy(entry=entry_expr, exit=exit_expr)
 
+    def _defer_unknown(self, index: int, message: str) -> None:
+        if self._unknown_name is None or index < self._unknown_name[0]:
+            self._unknown_name = (index, message)
+
     # --- boolean expressions ---
 
     def parse_bool_expr(self):
         return self.parse_or_expr()
 
+    # The operator loops read token types from self.types, which ends with an
+    # EOF sentinel, so each test is one list index with no bounds check.
+    # self.pos stays authoritative because the operand parsers advance it too.
+
     def parse_or_expr(self):
         node = self.parse_and_expr()
-        while True:
-            tok = self.peek()
-            if tok and tok.type == "IDENT" and tok.value == "OR":
-                self.advance()
-                right = self.parse_and_expr()
-                node = BinaryOp(left=node, op="OR", right=right)
-            else:
-                break
+        types = self.types
+        while types[self.pos] == "OR":
+            self.pos += 1
+            right = self.parse_and_expr()
+            node = BinaryOp(left=node, op="OR", right=right)
         return node
 
     def parse_and_expr(self):
         node = self.parse_not_expr()
-        while True:
-            tok = self.peek()
-            if tok and tok.type == "IDENT" and tok.value == "AND":
-                self.advance()
-                right = self.parse_not_expr()
-                node = BinaryOp(left=node, op="AND", right=right)
-            else:
-                break
+        types = self.types
+        while types[self.pos] == "AND":
+            self.pos += 1
+            right = self.parse_not_expr()
+            node = BinaryOp(left=node, op="AND", right=right)
         return node
 
     def parse_not_expr(self):
-        tok = self.peek()
-        if tok and tok.type == "IDENT" and tok.value == "NOT":
-            self.advance()
+        if self.types[self.pos] == "NOT":
+            self.pos += 1
             operand = self.parse_not_expr()
             return UnaryOp(op="NOT", operand=operand)
         return self.parse_comparison()
@@ -243,56 +323,40 @@ class Parser:
 
     def parse_comparison(self):
         left = self.parse_arith_expr()
-        tok = self.peek()
-        if tok is None:
-            return left
-
-        if tok.type in ("GT", "LT", "GE", "LE", "EQ", "NE"):
-            op_map = {
-                "GT": ">",
-                "LT": "<",
-                "GE": ">=",
-                "LE": "<=",
-                "EQ": "==",
-                "NE": "!=",
-            }
-            op = op_map[tok.type]
-            self.advance()
+        kind = self.types[self.pos]
+
+        if kind in _CMP_TYPES:
+            op = _OP_MAP[kind]
+            self.pos += 1
             right = self.parse_arith_expr()
             return BinaryOp(left=left, op=op, right=right)
 
-        if tok.type == "IDENT" and tok.value in ("CROSSOVER", "CROSSUNDER"):
-            op = tok.value
-            self.advance()
+        if kind in _CROSS_IDENTS:
+            # Reserved-word tokens carry their own name as the type
+            self.pos += 1
             right = self.parse_arith_expr()
-            return BinaryOp(left=left, op=op, right=right)
+            return BinaryOp(left=left, op=kind, right=right)
 
         return left
 
     def parse_arith_expr(self):
         node = self.parse_term()
-        while True:
-            tok = self.peek()
-            if tok and tok.type in ("PLUS", "MINUS"):
-                op = tok.value
-                self.advance()
-                right = self.parse_term()
-                node = BinaryOp(left=node, op=op, right=right)
-            else:
-                break
+        types = self.types
+        while types[self.pos] in _ADDSUB:
+            op = self.tokens[self.pos].value
+            self.pos += 1
+            right = self.parse_term()
+            node = BinaryOp(left=node, op=op, right=right)
         return node
 
     def parse_term(self):
         node = self.parse_factor()
-        while True:
-            tok = self.peek()
-            if tok and tok.type in ("TIMES", "DIV"):
-                op = tok.value
-                self.advance()
-                right = self.parse_factor()
-                node = BinaryOp(left=node, op=op, right=right)
-            else:
-                break
+        types = self.types
+        while types[self.pos] in _MULDIV:
+            op = self.tokens[self.pos].value
+            self.pos += 1
+            right = self.parse_factor()
+            node = BinaryOp(left=node, op=op, right=right)
         return node
 
     def parse_factor(self):
@@ -302,25 +366,20 @@ class Parser:
 
         if tok.type == "NUMBER":
             self.advance()
-            # support numeric suffixes like 1M, 2K
-            nxt = self.peek()
-            if nxt and nxt.type == "SUFFIX":
-                self.advance()
-                base = float(tok.value)
-                mul = 1_000_000.0 if nxt.value.upper() == "M" else 1_000.0
-                return Literal(value=base * mul)
-            return Literal(value=float(tok.value))
+            return _number_literal(tok.value)
 
         if tok.type == "TRUE":
             self.advance()
-            return Literal(value=1.0)
+            return _LIT_TRUE
 
         if tok.type == "FALSE":
             self.advance()
-            return Literal(value=0.0)
+            return _LIT_FALSE
 
-        if tok.type == "IDENT":
+        # Reserved words are identifiers here too, e.g. CROSSOVER(a, b)
+        if tok.type == "IDENT" or tok.type in _KEYWORDS:
             ident = tok.value
+            ident_index = self.pos
             self.advance()
             next_tok = self.peek()
 
@@ -328,10 +387,11 @@ class Parser:
             if next_tok and next_tok.type == "LPAREN":
                 self.advance()  # consume '('
                 args = []
-                if self.peek() and self.peek().type != "RPAREN":
+                types = self.types
+                if types[self.pos] not in ("RPAREN", _EOF):
                     args.append(self.parse_bool_expr())
-                    while self.peek() and self.peek().type == "COMMA":
-                        self.advance()
+                    while types[self.pos] == "COMMA":
+                        self.pos += 1
                         args.append(self.parse_bool_expr())
                 self.expect("RPAREN")
                 # Validate indicator name and arity (number of args), with suggestion
@@ -341,19 +401,25 @@ class Parser:
                     # Suggest closest function name
                     try:
                         valid = VALID_FUNCS
-                        import difflib
                         suggestion = difflib.get_close_matches(ident, list(valid), n=1)
                         if suggestion:
                             raise DSLParseError(f"{str(e)}. Did you mean {suggestion[0]}?")
                     except Exception:
                         raise DSLParseError(str(e))
-                return FuncCall(name=ident, args=args)
+                    self._defer_unknown(ident_index, f"Unknown function: {ident}")
+                return FuncCall(name=ident, args=tuple(args))
 
             # series reference IDENT[NUMBER]?
             lag = 0
             if self.peek() and self.peek().type == "LBRACK":
                 self.advance()  # '['
                 lag_tok = self.expect("NUMBER")
+                if lag_tok.value[-1] in _MULTIPLIERS:
+                    raise DSLParseError(
+                        f"Series lag must be a plain bar count, got {lag_tok.value}",
+                        line=lag_tok.line,
+                        col=lag_tok.col,
+                    )
                 lag = int(float(lag_tok.value))
                 self.expect("RBRACK")
 
@@ -364,13 +430,13 @@ class Parser:
             except ValueError as e:
                 # Suggest closest series name
                 try:
-                    import difflib
                     suggestion = difflib.get_close_matches(series_name, list(VALID_SERIES), n=1)
                     if suggestion:
                         raise DSLParseError(f"{str(e)}. Did you mean {suggestion[0]}?")
                 except Exception:
                     raise DSLParseError(str(e))
-            return SeriesRef(name=series_name, lag=lag)
+                self._defer_unknown(ident_index, f"Unknown series: {series_name}")
+            return _series_ref(series_name, lag)
 
         if tok.type == "LPAREN":
             self.advance()
@@ -388,38 +454,69 @@ class Parser:
 # Use centralized sets from validator
 
 
+def _walk_binop(node, walk):
+    walk(node.left)
+    walk(node.right)
+
+
+def _walk_unary(node, walk):
+    walk(node.operand)
+
+
+def _walk_series(node, walk):
+    if node.name not in VALID_SERIES:
+        raise DSLParseError(f"Unknown series: {node.name}")
+
+
+def _walk_func(node, walk):
+    if node.name not in VALID_FUNCS:
+        raise DSLParseError(f"Unknown function: {node.name}")
+    for a in node.args:
+        walk(a)
+
+
+def _walk_strategy(node, walk):
+    walk(node.entry)
+    walk(node.exit)
+
+
+# Per-node-type checks, looked up by exact type; other nodes (Literal) pass
+_WALKERS = {
+    BinaryOp: _walk_binop,
+    UnaryOp: _walk_unary,
+    SeriesRef: _walk_series,
+    FuncCall: _walk_func,
+    Strategy: _walk_strategy,
+}
+
+
 def validate_strategy(strategy: Strategy):
     """Validate that all series and functions are known."""
 
     def walk(node):
-        if isinstance(node, BinaryOp):
-            walk(node.left)
-            walk(node.right)
-        elif isinstance(node, UnaryOp):
-            walk(node.operand)
-        elif isinstance(node, SeriesRef):
-            if node.name not in VALID_SERIES:
-                raise DSLParseError(f"Unknown series: {node.name}")
-        elif isinstance(node, FuncCall):
-            if node.name not in VALID_FUNCS:
-                raise DSLParseError(f"Unknown function: {node.name}")
-            for a in node.args:
-                walk(a)
-        elif isinstance(node, Literal):
-            return
-        elif isinstance(node, Strategy):
-            walk(node.entry)
-            walk(node.exit)
-        else:
-            return
+        walker = _WALKERS.get(type(node))
+        if walker is not None:
+            walker(node, walk)
 
     walk(strategy)
 
 
-def parse_dsl(dsl_text: str) -> Strategy:
-    """Parse DSL text into a Strategy AST and validate it."""
+@lru_cache(maxsize=512)
+def _parse_dsl_cached(dsl_text: str) -> Strategy:
     tokens = tokenize(dsl_text)
     parser = Parser(tokens, source_text=dsl_text)
-    strategy = parser.parse_strategy()
-    validate_strategy(strategy)
-    return strategy
+    # Names are validated while parsing; no second validate_strategy pass
+    return parser.parse_strategy()
+
+
+def parse_dsl(dsl_text: str) -> Strategy:
+    """
+    Parse DSL text into a Strategy AST and validate it.
+
+    Results are cached by text (LRU, 512 entries), so re-parsing the same
+    strategy returns the same, immutable Strategy. Failed parses are not cached.
+    """
+    return _parse_dsl_cached(dsl_text)
+
+
+parse_dsl.cache_clear = _parse_dsl_cached.cache_clear  # type: ignore[attr-defined]
@@ -7,13 +7,59 @@ Currently supported:
 - RSI (Relative Strength Index, Wilder-style)
 - MACD (Moving Average Convergence Divergence)
 - BBANDS (Bollinger Bands)
+
+``sma_frame``/``ema_frame``/``rsi_frame``/``macd_frame`` take a DataFrame with
+one column per symbol; with Numba the columns are computed in parallel.
 """
 
 from __future__ import annotations
 
+import os
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
+# Import with fallback for script execution
+try:
+    from ._kernels import (
+        _ewm_mean,
+        _ewm_mean_rows,
+        _macd,
+        _macd_rows,
+        _rolling_mean,
+        _rolling_mean_rows,
+        _rolling_std,
+        _rsi,
+        _rsi_rows,
+    )
+    from ._njit import HAS_NUMBA
+except ImportError:  # script mode
+    from _kernels import (  # type: ignore
+        _ewm_mean,
+        _ewm_mean_rows,
+        _macd,
+        _macd_rows,
+        _rolling_mean,
+        _rolling_mean_rows,
+        _rolling_std,
+        _rsi,
+        _rsi_rows,
+    )
+    from _njit import HAS_NUMBA  # type: ignore
+
+try:
+    import talib  # type: ignore
+
+    HAS_TALIB = True
+except ImportError:  # TA-Lib is optional
+    talib = None
+    HAS_TALIB = False
+
+# TA-Lib rounds differently from pandas (and from the Numba kernels codegen
+# uses), so it is opt-in: set NL_DSL_USE_TALIB=1 to route SMA/BBANDS through it
+_USE_TALIB = HAS_TALIB and os.environ.get("NL_DSL_USE_TALIB", "0") == "1"
+
 __all__ = [
     "sma",
     "ema",
@@ -24,9 +70,68 @@ __all__ = [
     "bblower",
     "macd_signal",
     "macd_hist",
+    "sma_frame",
+    "ema_frame",
+    "rsi_frame",
+    "macd_frame",
 ]
 
 
+def _int_windows(*windows, minimum: int = 1) -> bool:
+    return all(
+        isinstance(w, (int, np.integer)) and not isinstance(w, bool) and w >= minimum
+        for w in windows
+    )
+
+
+def _use_kernel(series: pd.Series, *windows) -> bool:
+    """
+    True when a compiled kernel can stand in for the pandas computation.
+
+    Kernels need Numba, a numeric series and integer windows >= 1; anything
+    else goes through pandas, which also raises its usual errors.
+    """
+    return HAS_NUMBA and series.dtype.kind in "iuf" and _int_windows(*windows)
+
+
+def _as_f64(series: pd.Series) -> np.ndarray:
+    """The series values as float64; a view, not a copy, when already float64."""
+    return series.to_numpy(dtype=np.float64, copy=False)
+
+
+def _is_number(value) -> bool:
+    return not isinstance(value, bool) and isinstance(value, (int, float, np.integer, np.floating))
+
+
+def _talib_values(series: pd.Series, *windows) -> Optional[np.ndarray]:
+    """
+    float64 input for TA-Lib, or None when the call should stay on pandas/Numba.
+
+    TA-Lib periods start at 2, and a NaN poisons every later TA-Lib output
+    instead of just its own windows, so series with gaps are not handed over.
+    """
+    if not (_USE_TALIB and series.dtype.kind in "iuf" and _int_windows(*windows, minimum=2)):
+        return None
+    values = _as_f64(series)
+    if len(values) == 0 or not np.isfinite(values).all():
+        return None
+    return values
+
+
+def _talib_bbands(series: pd.Series, period, std) -> Optional[tuple[pd.Series, pd.Series, pd.Series]]:
+    if not _is_number(std):
+        return None
+    values = _talib_values(series, period)
+    if values is None:
+        return None
+    bands = talib.BBANDS(values, timeperiod=int(period), nbdevup=float(std), nbdevdn=float(std), matype=0)
+    return tuple(_from_kernel(band, series) for band in bands)
+
+
+def _from_kernel(values: np.ndarray, series: pd.Series) -> pd.Series:
+    return pd.Series(values, index=series.index, name=series.name)
+
+
 def sma(series: pd.Series, window: int) -> pd.Series:
     """
     Simple Moving Average (SMA).
@@ -43,6 +148,12 @@ def sma(series: pd.Series, window: int) -> pd.Series:
     pd.Series
         Rolling mean with the given window. The first (window-1) values are NaN.
     """
+    values = _talib_values(series, window)
+    if values is not None:
+        return _from_kernel(talib.SMA(values, timeperiod=int(window)), series)
+    if _use_kernel(series, window):
+        # Same Kahan-compensated running sum as pandas, so results match exactly
+        return _from_kernel(_rolling_mean(_as_f64(series), int(window)), series)
     return series.rolling(window=window, min_periods=window).mean()
 
 
@@ -62,6 +173,9 @@ def ema(series: pd.Series, window: int) -> pd.Series:
     pd.Series
         EMA with adjust=False for standard trading usage.
     """
+    if _use_kernel(series, window):
+        # The adjust=False recursion, seeded and NaN-skipping exactly like pandas
+        return _from_kernel(_ewm_mean(_as_f64(series), int(window)), series)
     return series.ewm(span=window, adjust=False).mean()
 
 
@@ -81,23 +195,47 @@ def rsi(series: pd.Series, window: int = 14) -> pd.Series:
     pd.Series
         RSI values in the range [0, 100]. Initial values may be NaN.
     """
+    if _use_kernel(series, window) and (series.dtype.kind in "iu" or series.dtype == np.float64):
+        # float32 input is left to pandas, which takes the differences in float32
+        return _from_kernel(_rsi(_as_f64(series), int(window)), series)
+
     delta = series.diff()
 
     # Separate gains and losses
     gain = delta.clip(lower=0)
     loss = -delta.clip(upper=0)
 
-    # Wilder's smoothing: use exponential-like rolling mean via simple rolling mean here
-    avg_gain = gain.rolling(window=window, min_periods=window).mean()
-    avg_loss = loss.rolling(window=window, min_periods=window).mean()
+    avg_gain = _wilder_mean(gain, window)
+    avg_loss = _wilder_mean(loss, window)
 
-    # Avoid division by zero
-    rs = avg_gain / avg_loss.replace(0, np.nan)
+    # No losses in the window gives RSI 100; a flat window (0 / 0) stays NaN
+    rs = avg_gain / avg_loss
 
     rsi_series = 100 - (100 / (1 + rs))
     return rsi_series
 
 
+def _wilder_mean(series: pd.Series, window: int) -> pd.Series:
+    """
+    Wilder's smoothing: the simple mean of the first full window, then an
+    exponential average with alpha = 1 / window.
+    """
+    seed = series.rolling(window=window, min_periods=window).mean()
+    valid = seed.notna().to_numpy()
+    first = int(valid.argmax()) if valid.any() else len(valid)
+    # Values up to the seed come from the rolling mean: NaN before it, the seed at it
+    seeded = series.where(np.arange(len(series)) > first, seed)
+    return seeded.ewm(com=window - 1, adjust=False).mean()
+
+
+def _macd_arrays(series: pd.Series, fast, slow, signal) -> Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """(line, signal, hist) arrays from the fused kernel, or None to use pandas."""
+    if not _use_kernel(series, fast, slow, signal):
+        return None
+    # All three EMAs advance together in a single pass over the input
+    return _macd(_as_f64(series), int(fast), int(slow), int(signal))
+
+
 def macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple[pd.Series, pd.Series, pd.Series]:
     """
     Moving Average Convergence Divergence (MACD).
@@ -120,6 +258,9 @@ def macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) ->
         signal_line = EMA(macd_line, signal)
         histogram = macd_line - signal_line
     """
+    arrays = _macd_arrays(series, fast, slow, signal)
+    if arrays is not None:
+        return tuple(_from_kernel(values, series) for values in arrays)
     ema_fast = ema(series, fast)
     ema_slow = ema(series, slow)
     macd_line = ema_fast - ema_slow
@@ -128,6 +269,34 @@ def macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) ->
     return macd_line, signal_line, hist
 
 
+def _bb_arrays(series: pd.Series, period, std) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    """(middle band, rolling std) arrays from the Numba kernels, or None to use pandas."""
+    if not (_use_kernel(series, period) and _is_number(std)):
+        return None
+    values = _as_f64(series)
+    return _rolling_mean(values, int(period)), _rolling_std(values, int(period))
+
+
+def _bb_mid_std(series: pd.Series, period: int) -> tuple[pd.Series, pd.Series]:
+    """Middle band and rolling population std through pandas."""
+    mid = sma(series, period)
+    rolling_std = series.rolling(window=period, min_periods=period).std(ddof=0)
+    return mid, rolling_std
+
+
+def _bb_band(series: pd.Series, period, std, side: int) -> pd.Series:
+    """The upper (side=1) or lower (side=-1) band on its own."""
+    bands = _talib_bbands(series, period, std)
+    if bands is not None:
+        return bands[1 - side]
+    arrays = _bb_arrays(series, period, std)
+    if arrays is not None:
+        mid, rolling_std = arrays
+        return _from_kernel(mid + std * rolling_std if side > 0 else mid - std * rolling_std, series)
+    mid, rolling_std = _bb_mid_std(series, period)
+    return mid + std * rolling_std if side > 0 else mid - std * rolling_std
+
+
 def bbands(series: pd.Series, period: int = 20, std: float = 2.0) -> tuple[pd.Series, pd.Series, pd.Series]:
     """
     Bollinger Bands.
@@ -148,28 +317,94 @@ def bbands(series: pd.Series, period: int = 20, std: float = 2.0) -> tuple[pd.Se
         Middle band = SMA(period)
         Lower band = SMA(period) - std * rolling_std
     """
-    mid = sma(series, period)
-    rolling_std = series.rolling(window=period, min_periods=period).std(ddof=0)
+    bands = _talib_bbands(series, period, std)
+    if bands is not None:
+        return bands
+    arrays = _bb_arrays(series, period, std)
+    if arrays is not None:
+        mid, rolling_std = arrays
+        upper = mid + std * rolling_std
+        lower = mid - std * rolling_std
+        return _from_kernel(upper, series), _from_kernel(mid, series), _from_kernel(lower, series)
+    mid, rolling_std = _bb_mid_std(series, period)
     upper = mid + std * rolling_std
     lower = mid - std * rolling_std
     return upper, mid, lower
 
 
 def bbupper(series: pd.Series, period: int = 20, std: float = 2.0) -> pd.Series:
-    upper, _mid, _lower = bbands(series, period=period, std=std)
-    return upper
+    return _bb_band(series, period, std, 1)
 
 
 def bblower(series: pd.Series, period: int = 20, std: float = 2.0) -> pd.Series:
-    _upper, _mid, lower = bbands(series, period=period, std=std)
-    return lower
+    return _bb_band(series, period, std, -1)
 
 
 def macd_signal(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.Series:
+    arrays = _macd_arrays(series, fast, slow, signal)
+    if arrays is not None:
+        return _from_kernel(arrays[1], series)
     _macd_line, signal_line, _hist = macd(series, fast=fast, slow=slow, signal=signal)
     return signal_line
 
 
 def macd_hist(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.Series:
+    arrays = _macd_arrays(series, fast, slow, signal)
+    if arrays is not None:
+        return _from_kernel(arrays[2], series)
     macd_line, signal_line, hist = macd(series, fast=fast, slow=slow, signal=signal)
     return hist
+
+
+# ----- One column per symbol -----
+
+
+def _frame_rows(df: pd.DataFrame, *windows, float32_ok: bool = True) -> Optional[np.ndarray]:
+    """Symbols-by-bars float64 matrix for the row kernels, or None to use pandas."""
+    if not (HAS_NUMBA and _int_windows(*windows)):
+        return None
+    for dtype in df.dtypes:
+        if dtype.kind not in "iuf" or (not float32_ok and dtype.kind == "f" and dtype != np.float64):
+            return None
+    return np.ascontiguousarray(df.to_numpy(dtype=np.float64).T)
+
+
+def _to_frame(rows: np.ndarray, df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame(rows.T, index=df.index, columns=df.columns)
+
+
+def sma_frame(df: pd.DataFrame, window: int) -> pd.DataFrame:
+    """``sma`` of every column of ``df``."""
+    rows = _frame_rows(df, window)
+    if rows is not None:
+        return _to_frame(_rolling_mean_rows(rows, int(window)), df)
+    return df.rolling(window=window, min_periods=window).mean()
+
+
+def ema_frame(df: pd.DataFrame, window: int) -> pd.DataFrame:
+    """``ema`` of every column of ``df``."""
+    rows = _frame_rows(df, window)
+    if rows is not None:
+        return _to_frame(_ewm_mean_rows(rows, int(window)), df)
+    return df.ewm(span=window, adjust=False).mean()
+
+
+def rsi_frame(df: pd.DataFrame, window: int = 14) -> pd.DataFrame:
+    """``rsi`` of every column of ``df``."""
+    rows = _frame_rows(df, window, float32_ok=False)
+    if rows is not None:
+        return _to_frame(_rsi_rows(rows, int(window)), df)
+    return df.apply(rsi, args=(window,))
+
+
+def macd_frame(
+    df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """``macd`` of every column of ``df`` as (macd_line, signal_line, histogram) frames."""
+    rows = _frame_rows(df, fast, slow, signal)
+    if rows is not None:
+        lines = _macd_rows(rows, int(fast), int(slow), int(signal))
+        return tuple(_to_frame(values, df) for values in lines)
+    macd_line = df.ewm(span=fast, adjust=False).mean() - df.ewm(span=slow, adjust=False).mean()
+    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+    return macd_line, signal_line, macd_line - signal_line
@@ -1,46 +1,82 @@
+import pickle
 import re
+import threading
+from functools import lru_cache
+
+# Optional spaCy backend, resolved once. Only available when imported as a
+# package; a broken spaCy install can fail with more than ImportError.
+try:
+    from . import nlp_spacy as _SPACY_BACKEND
+except Exception:
+    _SPACY_BACKEND = None
+
+# Patterns are compiled once at import; the parser runs them for every clause.
+# A segment runs to the next period: '.[^.]*' is '.+?(?:\.|$)' without the
+# lazy backtracking (at least one character, then everything up to a '.').
+_ENTRY_PATTERNS = [
+    re.compile(r'(buy when .[^.]*)'),
+    re.compile(r'(enter when .[^.]*)'),
+    re.compile(r'(trigger entry when .[^.]*)'),
+    re.compile(r'(buy .[^.]*)'),
+]
+_EXIT_PATTERNS = [
+    re.compile(r'(exit when .[^.]*)'),
+    re.compile(r'(sell when .[^.]*)'),
+    re.compile(r'(exit .[^.]*)'),
+    re.compile(r'(sell .[^.]*)'),
+]
+_WHEN_RE = re.compile(r"when (.+)")
+_VERB_STRIP_RE = re.compile(r"^(buy|enter|trigger entry|exit|sell)\s+")
+_AND_OR_SPLIT = re.compile(r"\s+(and|or)\s+")
+
+# Clause patterns for parse_segment, in rule order
+_MA_WINDOW_RE = re.compile(r"(\d+)[-\s]*day\s+(moving average|ma)")
+_VOLUME_THRESHOLD_RE = re.compile(r"(?:above|greater than|over|below|less than|under)\s+((?:[0-9]+\s+million)|(?:[0-9.]+m)|(?:[0-9.]+k)|(?:[0-9]+\s+thousand)|(?:[0-9,.]+))")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_CROSS_OVER_RE = re.compile(r"\bcross(?:es|ed)?\s+over\b")
+_CROSS_UNDER_RE = re.compile(r"\bcross(?:es|ed)?\s+under\b")
+_BREAKS_RE = re.compile(r"\bbreaks\s+(above|below)\b")
+_RSI_WINDOW_RE = re.compile(r"rsi\s*\(\s*(\d+)\s*\)")
+_OVERBOUGHT_RE = re.compile(r"overbought\s+(?:at|above)\s+(\d+(\.\d+)?)")
+_OVERSOLD_RE = re.compile(r"oversold\s+(?:at|below)\s+(\d+(\.\d+)?)")
+_BELOW_NUMBER_RE = re.compile(r"below\s+(\d+(\.\d+)?)")
+_ABOVE_NUMBER_RE = re.compile(r"above\s+(\d+(\.\d+)?)")
+_PERCENT_RE = re.compile(r"more than\s+(\d+(\.\d+)?)\s*percent")
+_MA_CROSS_WINDOW_RE = re.compile(r"(\d+)[-\s]*day\s+(moving average|ma|ema)")
+_LAST_DAYS_RE = re.compile(r"last\s+(\d+)\s+(days|day|sessions|bars|trading days)")
+_FIELD_VS_LAG_RE = re.compile(r"(close|price|volume|high|low)\s+is\s+(above|below)\s+")
+_FIELD_VS_NUMBER_RE = re.compile(r"(close|price|volume)\s+is\s+(above|below)\s+([0-9,.]+)")
+_EMA_WINDOW_RE = re.compile(r"ema\s*\(\s*(\d+)\s*\)|\b(\d+)[-\s]*day\s+ema\b")
+_MACD_SIGNAL_RE = re.compile(r"macd\s+(?:line\s+)?(?:is\s+)?(above|below)\s+(?:the\s+)?signal(?:\s+line)?")
+_MACD_HIST_RE = re.compile(r"macd\s+hist(?:ogram)?\s+(?:is\s+)?(above|below)\s+0")
+_BB_PARAMS_RE = re.compile(r"\((\d+)\s*,\s*(\d+(?:\.\d+)?)\)")
+_BB_WINDOW_STD_RE = re.compile(r"(\d+)[-\s]*day\s+bollinger\s+band\s*(\d+(?:\.\d+)?)\s*std")
+_BB_BAND_RE = re.compile(r"(above|below|exceeds|drops below|breaches|pierces)\s+(upper|lower)\s+bollinger\s+band")
+
+# extract_phrases_with_spacy fallback when spaCy is missing
+_PHRASE_MA_RE = re.compile(r"\b(\d+)[-\s]*day\s+(moving average|ma)\b")
+_PHRASE_RSI_RE = re.compile(r"\brsi\s*\(\s*\d+\s*\)")
+_PHRASE_COMPARISON_RE = re.compile(r"\b(above|below|greater than|less than|over|under|crosses|increases)\b")
+_PHRASE_TIME_RE = re.compile(r"\b(yesterday|last week|previous week)\b")
+_PHRASE_NUMBER_RE = re.compile(r"\b(\d+[,.]*\d*)\s*(million|m|day|days)\b")
+_PHRASE_WINDOW_RE = re.compile(r"\b\d+[-\s]*day\b")
 
 
 def normalize_text(text):
     """Lowercase and normalize whitespace."""
-    return re.sub(r'\s+', ' ', text.strip().lower())
+    return ' '.join(text.lower().split())
 
 
 def _extract_segment(text: str, patterns: list) -> str:
-    """Try multiple regex patterns and return the first matching segment."""
+    """Try multiple compiled patterns and return the first matching segment."""
     for pat in patterns:
-        m = re.search(pat, text)
+        m = pat.search(text)
         if m:
             return m.group(1)
     return ""
 
 
-def parse_natural_language_to_structured(nl_text: str) -> dict:
-    """
-    Parse natural language into a canonical structured JSON dict without converting to DSL.
-
-    Schema:
-      {
-        "entry": [condition, ...],
-        "exit": [condition, ...]
-      }
-    where each condition is:
-      {
-        "left": <string or {"type":"indicator","name":..., "args":[...]}>,
-        "operator": one of [">","<",">=","<=","=="],
-        "right": <number or string or indicator dict>,
-        "modifiers": optional dict like {"lag":5, "percent":0.3, "cross":true}
-      }
-
-    Example:
-      Input: "Buy when the close price is above the 20-day moving average and volume is above 1 million."
-      Returns (entry shown):
-        [
-          {"left": "close", "operator": ">", "right": {"type":"indicator","name":"sma","args":["close",20]}},
-          {"left": "volume", "operator": ">", "right": 1000000}
-        ]
-    """
-
+def _parse_structured(nl_text: str) -> dict:
     text = normalize_text(nl_text)
 
     def indicator(name: str, *args):
@@ -50,7 +86,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
         if not seg_text:
             return []
         # Strengthened splitting: capture phrases with their connective
-        tokens = re.split(r"\s+(and|or)\s+", seg_text)
+        tokens = _AND_OR_SPLIT.split(seg_text)
         phrase_chain = []  # list of (clause_text, connective_before)
         current_bool = None
         for tok in tokens:
@@ -66,7 +102,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
 
             # 1) close above/below N-day moving average
             if ("close price" in c or "close" in c) and ("moving average" in c or "ma" in c):
-                m = re.search(r"(\d+)[-\s]*day\s+(moving average|ma)", c)
+                m = _MA_WINDOW_RE.search(c)
                 if m and ("above" in c or "below" in c):
                     window = int(m.group(1))
                     op = ">" if "above" in c else "<"
@@ -80,7 +116,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
 
             # 2) volume threshold (e.g., above 1 million)
             if "volume" in c and ("above" in c or "below" in c or "greater than" in c or "less than" in c or "over" in c or "under" in c or "exceeds" in c or "drops below" in c or "breaches" in c or "pierces" in c):
-                m = re.search(r"(?:above|greater than|over|below|less than|under)\s+((?:[0-9]+\s+million)|(?:[0-9.]+m)|(?:[0-9.]+k)|(?:[0-9]+\s+thousand)|(?:[0-9,.]+))", c)
+                m = _VOLUME_THRESHOLD_RE.search(c)
                 if m:
                     raw = m.group(1)
                     raw_clean = raw.strip().rstrip(".,")
@@ -92,17 +128,17 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                         try:
                             num = float(raw_clean.split()[0])
                         except Exception:
-                            num = float(re.findall(r"\d+(?:\.\d+)?", raw_clean)[0])
+                            num = float(_NUMBER_RE.findall(raw_clean)[0])
                         val = num * 1_000_000
                     elif (raw_clean.endswith(" thousand") or " thousand" in raw_clean):
                         try:
                             num = float(raw_clean.split()[0])
                         except Exception:
-                            num = float(re.findall(r"\d+(?:\.\d+)?", raw_clean)[0])
+                            num = float(_NUMBER_RE.findall(raw_clean)[0])
                         val = num * 1_000
                     else:
                         val = float(raw_clean.replace(",", ""))
-                    is_above = any(kw in c for kw in ("above", "greater than", "over", "exceeds", "breaches", "pierces")) and ("drops below" not in c)
+                    is_above = ("above" in c or "greater than" in c or "over" in c or "exceeds" in c or "breaches" in c or "pierces" in c) and ("drops below" not in c)
                     op = ">" if is_above else "<"
                     clauses.append({
                         "left": "volume",
@@ -113,10 +149,10 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                     continue
 
             # 3) Enter when price crosses above yesterday's high -> use modifiers lag=1 and cross=true
-            if (re.search(r"\bcross(?:es|ed)?\s+over\b", c) or re.search(r"\bcross(?:es|ed)?\s+under\b", c) or "crosses above" in c or "crosses below" in c or re.search(r"\bbreaks\s+(above|below)\b", c)) and "yesterday" in c and ("high" in c or "low" in c):
+            if "yesterday" in c and ("high" in c or "low" in c) and ("crosses above" in c or "crosses below" in c or _CROSS_OVER_RE.search(c) or _CROSS_UNDER_RE.search(c) or _BREAKS_RE.search(c)):
                 clauses.append({
                     "left": "close",
-                    "operator": ">" if ("above" in c or re.search(r"over", c)) else "<",
+                    "operator": ">" if ("above" in c or "over" in c) else "<",
                     "right": "high" if "high" in c else "low",
                     "modifiers": {"lag": 1, "cross": True},
                     "bool_with_prev": connective
@@ -125,12 +161,12 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
 
             # 4) Exit when RSI(14) is below/above X
             if "rsi" in c:
-                m = re.search(r"rsi\s*\(\s*(\d+)\s*\)", c)
+                m = _RSI_WINDOW_RE.search(c)
                 window = int(m.group(1)) if m else 14
                 # aliases: overbought/oversold
                 # support custom thresholds/periods like "RSI(7) overbought at 80"
                 if "overbought" in c:
-                    thr_match = re.search(r"overbought\s+(?:at|above)\s+(\d+(\.\d+)?)", c)
+                    thr_match = _OVERBOUGHT_RE.search(c)
                     thr = float(thr_match.group(1)) if thr_match else 70.0
                     clauses.append({
                         "left": indicator("rsi", "close", window),
@@ -140,7 +176,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                     })
                     continue
                 if "oversold" in c:
-                    thr_match = re.search(r"oversold\s+(?:at|below)\s+(\d+(\.\d+)?)", c)
+                    thr_match = _OVERSOLD_RE.search(c)
                     thr = float(thr_match.group(1)) if thr_match else 30.0
                     clauses.append({
                         "left": indicator("rsi", "close", window),
@@ -150,7 +186,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                     })
                     continue
                 if "below" in c:
-                    thr_match = re.search(r"below\s+(\d+(\.\d+)?)", c)
+                    thr_match = _BELOW_NUMBER_RE.search(c)
                     if thr_match:
                         thr = float(thr_match.group(1))
                         clauses.append({
@@ -161,7 +197,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                         })
                         continue
                 if "above" in c:
-                    thr_match = re.search(r"above\s+(\d+(\.\d+)?)", c)
+                    thr_match = _ABOVE_NUMBER_RE.search(c)
                     if thr_match:
                         thr = float(thr_match.group(1))
                         clauses.append({
@@ -174,7 +210,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
 
             # 5) Volume increases by more than X percent compared to last week -> modifiers percent, lag
             if "volume" in c and "percent" in c and ("last week" in c or "previous week" in c):
-                m = re.search(r"more than\s+(\d+(\.\d+)?)\s*percent", c)
+                m = _PERCENT_RE.search(c)
                 if m:
                     pct = float(m.group(1)) / 100.0
                     clauses.append({
@@ -187,8 +223,8 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                     continue
 
             # 6) Moving average cross phrases: cross above/below the N-day MA
-            if (("cross" in c or re.search(r"\bcross(?:es|ed)?\b", c)) and ("above" in c or "below" in c or "over" in c or "under" in c)) and ("moving average" in c or "ma" in c or "ema" in c or re.search(r"\bema\b", c)):
-                m = re.search(r"(\d+)[-\s]*day\s+(moving average|ma|ema)", c)
+            if "cross" in c and ("above" in c or "below" in c or "over" in c or "under" in c) and ("moving average" in c or "ma" in c or "ema" in c):
+                m = _MA_CROSS_WINDOW_RE.search(c)
                 if m:
                     window = int(m.group(1))
                     is_above = "above" in c
@@ -202,11 +238,11 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                     continue
 
             # 7) Last X days -> lag
-            m_last = re.search(r"last\s+(\d+)\s+(days|day|sessions|bars|trading days)", c)
+            m_last = _LAST_DAYS_RE.search(c) if "last" in c else None
             if m_last and ("above" in c or "below" in c):
                 lag_x = int(m_last.group(1))
                 # simplistic: compare field to its lagged value
-                fm = re.search(r"(close|price|volume|high|low)\s+is\s+(above|below)\s+", c)
+                fm = _FIELD_VS_LAG_RE.search(c)
                 if fm:
                     field_raw, cmp_raw = fm.groups()
                     field = "close" if field_raw in ("price", "close") else (field_raw)
@@ -221,7 +257,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                     continue
 
             # 8) Generic pattern: <field> is above/below <number>
-            gm = re.search(r"(close|price|volume)\s+is\s+(above|below)\s+([0-9,.]+)", c)
+            gm = _FIELD_VS_NUMBER_RE.search(c) if "is" in c else None
             if gm:
                 field_raw, cmp_raw, val_raw = gm.groups()
                 field = "close" if field_raw in ("price", "close") else "volume"
@@ -236,7 +272,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                 continue
 
             # 9) EMA direct mapping: EMA(N) or N-day EMA
-            m_ema = re.search(r"ema\s*\(\s*(\d+)\s*\)|\b(\d+)[-\s]*day\s+ema\b", c)
+            m_ema = _EMA_WINDOW_RE.search(c) if "ema" in c else None
             if m_ema and ("above" in c or "below" in c):
                 window = int(next(g for g in m_ema.groups() if g))
                 op = ">" if "above" in c else "<"
@@ -251,7 +287,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
             # 10) MACD vs signal and histogram
             if "macd" in c:
                 # macd above/below signal line
-                if re.search(r"macd\s+(?:line\s+)?(?:is\s+)?(above|below)\s+(?:the\s+)?signal(?:\s+line)?", c):
+                if _MACD_SIGNAL_RE.search(c):
                     is_above = "above" in c
                     clauses.append({
                         "left": indicator("macd", "close"),
@@ -261,7 +297,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                     })
                     continue
                 # macd histogram above/below 0
-                mh = re.search(r"macd\s+hist(?:ogram)?\s+(?:is\s+)?(above|below)\s+0", c)
+                mh = _MACD_HIST_RE.search(c)
                 if mh:
                     is_above = mh.group(1) == "above"
                     clauses.append({
@@ -275,8 +311,8 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
             # 11) Bollinger Bands upper/lower comparisons
             if "bollinger" in c or "band" in c:
                 # Capture optional params: window/stddev from forms like '(20,2)' or '20-day ... 2 std'
-                params_tuple = re.search(r"\((\d+)\s*,\s*(\d+(?:\.\d+)?)\)", c)
-                window_std_phrase = re.search(r"(\d+)[-\s]*day\s+bollinger\s+band\s*(\d+(?:\.\d+)?)\s*std", c)
+                params_tuple = _BB_PARAMS_RE.search(c)
+                window_std_phrase = _BB_WINDOW_STD_RE.search(c)
                 bb_window = None
                 bb_std = None
                 if params_tuple:
@@ -290,7 +326,7 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
                     bb_window = 20
                     bb_std = 2.0
                 # price above/below upper/lower band with synonyms
-                b = re.search(r"(above|below|exceeds|drops below|breaches|pierces)\s+(upper|lower)\s+bollinger\s+band", c)
+                b = _BB_BAND_RE.search(c)
                 if b:
                     cmp, which = b.groups()
                     is_above = cmp in ("above", "exceeds", "breaches", "pierces")
@@ -312,8 +348,9 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
 
     # Attempt spaCy optional backend first
     try:
-        from . import nlp_spacy  # type: ignore
-        spacy_struct = nlp_spacy.spacy_parse_nl(nl_text)
+        spacy_struct = None
+        if _SPACY_BACKEND is not None and _SPACY_BACKEND.HAS_SPACY:
+            spacy_struct = _SPACY_BACKEND.spacy_parse_nl(nl_text)
         if spacy_struct and (spacy_struct.get("entry") or spacy_struct.get("exit")):
             # Map spaCy structured into canonical indicator dicts where possible
             def map_clause(cl):
@@ -332,18 +369,8 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
 
     if not structured_entry and not structured_exit:
         # Regex pathway: extract entry/exit segments, then parse
-        entry_text = _extract_segment(text, [
-            r'(buy when .+?)(?:\.|$)',
-            r'(enter when .+?)(?:\.|$)',
-            r'(trigger entry when .+?)(?:\.|$)',
-            r'(buy .+?)(?:\.|$)'
-        ])
-        exit_text = _extract_segment(text, [
-            r'(exit when .+?)(?:\.|$)',
-            r'(sell when .+?)(?:\.|$)',
-            r'(exit .+?)(?:\.|$)',
-            r'(sell .+?)(?:\.|$)'
-        ])
+        entry_text = _extract_segment(text, _ENTRY_PATTERNS)
+        exit_text = _extract_segment(text, _EXIT_PATTERNS)
 
         # If nothing explicit, treat whole as entry
         if not entry_text and not exit_text:
@@ -353,10 +380,10 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
             if not seg:
                 return ""
             seg = seg.strip()
-            m = re.search(r"when (.+)", seg)
+            m = _WHEN_RE.search(seg)
             if m:
                 return m.group(1)
-            return re.sub(r"^(buy|enter|trigger entry|exit|sell)\s+", "", seg)
+            return _VERB_STRIP_RE.sub("", seg)
 
         structured_entry = parse_segment(strip_lead(entry_text))
         structured_exit = parse_segment(strip_lead(exit_text))
@@ -364,6 +391,49 @@ def parse_natural_language_to_structured(nl_text: str) -> dict:
     return {"entry": structured_entry, "exit": structured_exit}
 
 
+@lru_cache(maxsize=512)
+def _parse_structured_pickled(nl_text: str) -> bytes:
+    # Stored pickled: unpickling hands every caller a fresh copy and is
+    # several times cheaper than copying the nested dicts in Python
+    return pickle.dumps(_parse_structured(nl_text), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def parse_natural_language_to_structured(nl_text: str) -> dict:
+    """
+    Parse natural language into a canonical structured JSON dict without converting to DSL.
+
+    Schema:
+      {
+        "entry": [condition, ...],
+        "exit": [condition, ...]
+      }
+    where each condition is:
+      {
+        "left": <string or {"type":"indicator","name":..., "args":[...]}>,
+        "operator": one of [">","<",">=","<=","=="],
+        "right": <number or string or indicator dict>,
+        "modifiers": optional dict like {"lag":5, "percent":0.3, "cross":true}
+      }
+
+    Example:
+      Input: "Buy when the close price is above the 20-day moving average and volume is above 1 million."
+      Returns (entry shown):
+        [
+          {"left": "close", "operator": ">", "right": {"type":"indicator","name":"sma","args":["close",20]}},
+          {"left": "volume", "operator": ">", "right": 1000000}
+        ]
+
+    Results are cached by input text (LRU, 512 entries). Every call returns
+    its own copy, so callers may mutate the result freely.
+    """
+    if not isinstance(nl_text, str):
+        return _parse_structured(nl_text)
+    return pickle.loads(_parse_structured_pickled(nl_text))
+
+
+parse_natural_language_to_structured.cache_clear = _parse_structured_pickled.cache_clear  # type: ignore[attr-defined]
+
+
 def structured_to_dsl(structured: dict) -> str:
     """
     Convert structured JSON produced by parse_natural_language_to_structured into DSL text.
@@ -425,22 +495,51 @@ def structured_to_dsl(structured: dict) -> str:
         if not clauses:
             return "FALSE"  # to be supported by DSL parser
         # preserve AND/OR order from bool_with_prev
-        parts = []
-        first = True
-        for c in clauses:
-            expr = clause_to_dsl(c)
-            if first:
-                parts.append(expr)
-                first = False
-            else:
-                conj = c.get("bool_with_prev", "AND")
-                parts.append(conj + " " + expr)
+        first, *rest = clauses
+        parts = [clause_to_dsl(first)]
+        parts.extend(f"{c.get('bool_with_prev', 'AND')} {clause_to_dsl(c)}" for c in rest)
         return " ".join(parts)
 
     entry = join_clauses(structured.get("entry", []))
     exit_ = join_clauses(structured.get("exit", []))
     return f"ENTRY: {entry}\nEXIT:  {exit_}"
 
+_PHRASE_SPACY = None  # (nlp, PhraseMatcher), or False once spaCy is known missing
+_PHRASE_SPACY_LOCK = threading.Lock()
+
+
+def _phrase_spacy():
+    """
+    Load the spaCy pipeline and build the comparison/time matcher once.
+
+    Returns None when spaCy is not installed; that is also remembered, so the
+    failing import is not retried on every call.
+    """
+    global _PHRASE_SPACY
+    if _PHRASE_SPACY is not None:
+        return _PHRASE_SPACY or None
+    with _PHRASE_SPACY_LOCK:
+        if _PHRASE_SPACY is None:
+            try:
+                import spacy  # type: ignore
+                from spacy.matcher import PhraseMatcher  # type: ignore
+            except ImportError:
+                _PHRASE_SPACY = False
+                return None
+            try:
+                nlp = spacy.load('en_core_web_sm')
+            except Exception:
+                nlp = spacy.blank('en')
+
+            matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+            comp_phrases = ["above", "below", "greater", "greater than", "less", "less than", "over", "under", "crosses", "increases"]
+            time_phrases = ["yesterday", "last week", "previous week"]
+            matcher.add("COMPARISON", [nlp.make_doc(p) for p in comp_phrases])
+            matcher.add("TIME", [nlp.make_doc(p) for p in time_phrases])
+            _PHRASE_SPACY = (nlp, matcher)
+    return _PHRASE_SPACY or None
+
+
 def extract_phrases_with_spacy(nl_text: str) -> dict:
     """
     Extract key phrases from natural language using spaCy when available.
@@ -463,22 +562,11 @@ def extract_phrases_with_spacy(nl_text: str) -> dict:
         'numbers': []
     }
 
-    try:
-        import spacy  # type: ignore
-        from spacy.matcher import PhraseMatcher  # type: ignore
-        try:
-            nlp = spacy.load('en_core_web_sm')
-        except Exception:
-            nlp = spacy.blank('en')
-
+    spacy_parts = _phrase_spacy()
+    if spacy_parts is not None:
+        nlp, matcher = spacy_parts
         doc = nlp(text)
 
-        matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
-        comp_phrases = ["above", "below", "greater", "greater than", "less", "less than", "over", "under", "crosses", "increases"]
-        time_phrases = ["yesterday", "last week", "previous week"]
-        matcher.add("COMPARISON", [nlp.make_doc(p) for p in comp_phrases])
-        matcher.add("TIME", [nlp.make_doc(p) for p in time_phrases])
-
         matches = matcher(doc)
         for mid, start, end in matches:
             label = nlp.vocab.strings[mid]
@@ -499,7 +587,7 @@ def extract_phrases_with_spacy(nl_text: str) -> dict:
                 window_phrase = None
                 span3 = doc[i:i+5]
                 span3_text = span3.text.lower()
-                if re.search(r"\b\d+[-\s]*day\b", span3_text) and ("moving average" in span3_text or "ma" in span3_text):
+                if _PHRASE_WINDOW_RE.search(span3_text) and ("moving average" in span3_text or "ma" in span3_text):
                     window_phrase = span3.text
                     result['indicators'].append(window_phrase)
                 num_entry = {'value': num_text}
@@ -512,17 +600,17 @@ def extract_phrases_with_spacy(nl_text: str) -> dict:
             if "moving average" in txt or txt == "rsi" or txt.startswith("rsi("):
                 result['indicators'].append(chunk.text)
 
-    except ImportError:
+    else:
         low = text.lower()
-        for m in re.finditer(r"\b(\d+)[-\s]*day\s+(moving average|ma)\b", low):
+        for m in _PHRASE_MA_RE.finditer(low):
             result['indicators'].append(m.group(0))
-        for m in re.finditer(r"\brsi\s*\(\s*\d+\s*\)", low):
+        for m in _PHRASE_RSI_RE.finditer(low):
             result['indicators'].append(m.group(0))
-        for m in re.finditer(r"\b(above|below|greater than|less than|over|under|crosses|increases)\b", low):
+        for m in _PHRASE_COMPARISON_RE.finditer(low):
             result['comparisons'].append(m.group(0))
-        for m in re.finditer(r"\b(yesterday|last week|previous week)\b", low):
+        for m in _PHRASE_TIME_RE.finditer(low):
             result['times'].append(m.group(0))
-        for m in re.finditer(r"\b(\d+[,.]*\d*)\s*(million|m|day|days)\b", low):
+        for m in _PHRASE_NUMBER_RE.finditer(low):
             result['numbers'].append({'value': m.group(1), 'unit': m.group(2)})
 
     def dedupe(seq):
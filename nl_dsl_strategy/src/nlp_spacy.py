@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Dict, List, Any
 
 try:
@@ -8,15 +9,33 @@ try:
 except ImportError:
     spacy = None  # type: ignore
 
+HAS_SPACY = spacy is not None
 
-def _ensure_nlp():
-    if spacy is None:
-        raise ImportError("spaCy is not installed. Please 'pip install spacy' and a model like 'python -m spacy download en_core_web_sm'.")
+# Sentence patterns, compiled once at import
+_SMA_WINDOW_RE = re.compile(r"(\d+)\s*(?:day\s*)?sma")
+_RSI_WINDOW_RE = re.compile(r"rsi\s*\(?\s*(\d+)?\s*\)?")
+_ABOVE_RE = re.compile(r"(close|price|volume|rsi)\s*(?:is\s*)?(?:above|over|>)\s*([0-9.]+m|[0-9.,]+)")
+_BELOW_RE = re.compile(r"(close|price|volume|rsi)\s*(?:is\s*)?(?:below|under|<)\s*([0-9.]+m|[0-9.,]+)")
+_RSI_THRESHOLD_RE = re.compile(r"rsi.*?(above|over|>|below|under|<)\s*(\d+(?:\.\d+)?)")
+
+
+@lru_cache(maxsize=None)
+def _load_model():
+    """Load en_core_web_sm once per process; None when the model is missing."""
     try:
         return spacy.load("en_core_web_sm")
     except Exception:
+        return None
+
+
+def _ensure_nlp():
+    if spacy is None:
+        raise ImportError("spaCy is not installed. Please 'pip install spacy' and a model like 'python -m spacy download en_core_web_sm'.")
+    nlp = _load_model()
+    if nlp is None:
         # try to download or guide user
         raise ImportError("spaCy model 'en_core_web_sm' not found. Install via: python -m spacy download en_core_web_sm")
+    return nlp
 
 
 def spacy_parse_nl(text: str) -> Dict[str, List[Dict[str, Any]]]:
@@ -44,14 +63,14 @@ def spacy_parse_nl(text: str) -> Dict[str, List[Dict[str, Any]]]:
     def parse_sentence(s: str) -> List[Dict[str, Any]]:
         clauses: List[Dict[str, Any]] = []
         # detect SMA patterns: e.g., "20 day sma" or "sma( close , 20 )"
-        sma_pat = re.findall(r"(\d+)\s*(?:day\s*)?sma", s)
-        rsi_pat = re.findall(r"rsi\s*\(?\s*(\d+)?\s*\)?", s)
+        sma_pat = _SMA_WINDOW_RE.findall(s)
+        rsi_pat = _RSI_WINDOW_RE.findall(s)
         # cross above/below
         cross_above = ("crosses above" in s) or ("cross above" in s) or ("crossover" in s)
         cross_below = ("crosses below" in s) or ("cross below" in s) or ("crossunder" in s)
         # thresholds
-        m_above = re.findall(r"(close|price|volume|rsi)\s*(?:is\s*)?(?:above|over|>)\s*([0-9.]+m|[0-9.,]+)", s)
-        m_below = re.findall(r"(close|price|volume|rsi)\s*(?:is\s*)?(?:below|under|<)\s*([0-9.]+m|[0-9.,]+)", s)
+        m_above = _ABOVE_RE.findall(s)
+        m_below = _BELOW_RE.findall(s)
 
         # SMA crossover with two windows
         if len(sma_pat) >= 2 and (cross_above or cross_below):
@@ -65,7 +84,7 @@ def spacy_parse_nl(text: str) -> Dict[str, List[Dict[str, Any]]]:
         if rsi_pat:
             rsi_p = int(rsi_pat[0] or 14)
             # map above/below for RSI
-            m = re.search(r"rsi.*?(above|over|>|below|under|<)\s*(\d+(?:\.\d+)?)", s)
+            m = _RSI_THRESHOLD_RE.search(s)
             if m:
                 comp = m.group(1)
                 thr = float(m.group(2))
@@ -43,3 +43,119 @@ def test_backtest_single_trade():
     assert stats["num_trades"] == 1
     # Total return should match PnL / starting_notional * 100
     assert abs(stats["total_return_pct"] - (10 / 110) * 100) < 1e-6
+
+
+def test_backtest_same_bar_exit_and_open_position():
+    # Entry and exit on the same flat bar close a zero-length trade there;
+    # a trailing entry with no exit is left open and not reported.
+    idx = pd.date_range("2023-01-01", periods=5, freq="D")
+    df = pd.DataFrame({"close": [100.0, 105.0, 110.0, 120.0, 130.0]}, index=idx)
+    signals = pd.DataFrame(index=df.index)
+    signals["entry"] = [True, True, False, True, False]
+    signals["exit"] = [True, False, True, False, False]
+
+    trades, stats = run_backtest(df, signals)
+
+    assert [(t.entry_date, t.exit_date) for t in trades] == [(idx[0], idx[0]), (idx[1], idx[2])]
+    assert trades[0].pnl == 0
+    assert trades[1].pnl == 5
+    assert stats["num_trades"] == 2
+
+
+def test_backtest_trade_records_are_columnar():
+    idx = pd.date_range("2023-01-01", periods=6, freq="D")
+    df = pd.DataFrame({"close": [100.0, 110.0, 120.0, 100.0, 90.0, 99.0]}, index=idx)
+    signals = pd.DataFrame(index=df.index)
+    signals["entry"] = [True, False, False, True, False, False]
+    signals["exit"] = [False, False, True, False, False, True]
+
+    trades, _ = run_backtest(df, signals)
+
+    assert list(trades.records["entry_idx"]) == [0, 3]
+    assert list(trades.records["exit_idx"]) == [2, 5]
+    assert trades.records["pnl"].sum() == sum(t.pnl for t in trades) == 19.0
+    assert trades[-1].exit_date == idx[5]
+    assert trades == list(trades)
+    assert trades != list(trades)[:1]
+
+
+def test_backtest_without_trades_equals_empty_list():
+    idx = pd.date_range("2023-01-01", periods=3, freq="D")
+    df = pd.DataFrame({"close": [100.0, 101.0, 102.0]}, index=idx)
+    signals = pd.DataFrame({"entry": [False] * 3, "exit": [False] * 3}, index=idx)
+
+    trades, stats = run_backtest(df, signals)
+
+    assert trades == []
+    assert stats["num_trades"] == 0
+
+
+def test_backtest_aligns_signals_by_label():
+    idx = pd.date_range("2023-01-01", periods=4, freq="D")
+    df = pd.DataFrame({"close": [100.0, 110.0, 120.0, 300.0]}, index=idx)
+    signals = pd.DataFrame(index=df.index)
+    signals["entry"] = [True, False, False, False]
+    signals["exit"] = [False, False, False, True]
+
+    expected_trades, expected_stats = run_backtest(df, signals)
+    trades, stats = run_backtest(df, signals.iloc[::-1])
+
+    assert stats["num_trades"] == 1
+    assert abs(stats["total_return_pct"] - 200.0) < 1e-9
+    assert list(trades) == list(expected_trades)
+    assert stats == expected_stats
+
+
+def test_backtest_rejects_signals_of_other_length():
+    import pytest
+
+    idx = pd.date_range("2023-01-01", periods=6, freq="D")
+    df = pd.DataFrame({"close": [100.0, 110.0, 120.0, 100.0, 90.0, 99.0]}, index=idx)
+    signals = pd.DataFrame({"entry": [True] * 6, "exit": [False] * 6}, index=idx)
+    # A duplicated label makes the aligned signals one row longer than df
+    signals = pd.concat([signals, signals.iloc[:1]])
+
+    with pytest.raises(ValueError):
+        run_backtest(df, signals)
+
+
+def test_backtest_batch_matches_individual_runs():
+    from backtest import run_backtest_batch
+
+    idx = pd.date_range("2023-01-01", periods=6, freq="D")
+    df = pd.DataFrame({"close": [100.0, 110.0, 120.0, 100.0, 90.0, 99.0]}, index=idx)
+    signals = pd.DataFrame(index=df.index)
+    signals["entry"] = [True, False, False, True, False, False]
+    signals["exit"] = [False, False, True, False, False, True]
+    params = [
+        {"slippage_bps": 0.0},
+        {"slippage_bps": 10.0, "fee_per_trade": 1.0},
+        {"position_size": 0.5, "mark_to_market": True},
+    ]
+
+    results = run_backtest_batch(df, signals, params, max_workers=2)
+
+    assert len(results) == len(params)
+    for p, (trades, stats) in zip(params, results):
+        expected_trades, expected_stats = run_backtest(df, signals, **p)
+        assert list(trades) == list(expected_trades)
+        assert stats == expected_stats
+
+    # Signals are aligned by label, as in run_backtest
+    reordered = run_backtest_batch(df, signals.iloc[::-1], params, max_workers=2)
+    for (trades, stats), (expected_trades, expected_stats) in zip(reordered, results):
+        assert list(trades) == list(expected_trades)
+        assert stats == expected_stats
+
+
+def test_backtest_batch_rejects_unknown_parameters():
+    import pytest
+    from backtest import run_backtest_batch
+
+    idx = pd.date_range("2023-01-01", periods=3, freq="D")
+    df = pd.DataFrame({"close": [100.0, 101.0, 102.0]}, index=idx)
+    signals = pd.DataFrame({"entry": [True, False, False], "exit": [False, False, True]}, index=idx)
+
+    for workers in (1, 2):
+        with pytest.raises(TypeError, match="slipage_bps"):
+            run_backtest_batch(df, signals, [{"slippage_bps": 5.0}, {"slipage_bps": 5.0}], max_workers=workers)
@@ -100,3 +100,129 @@ def test_generate_signals_macd_bbands_helpers():
     # Ensure evaluation completes and returns booleans; no guarantee of a signal in tiny sample
     assert signals["entry"].isin([True, False]).all()
     assert signals["exit"].isin([True, False]).all()
+
+
+def test_eval_ast_reuses_identical_subtrees():
+    from codegen import eval_ast
+
+    df = _build_small_df()
+    strategy = parse_dsl("ENTRY: close > SMA(close, 2) AND SMA(close, 2) > open EXIT: FALSE")
+    cache = {}
+    eval_ast(strategy.entry, df, cache)
+    first_sma = strategy.entry.left.right
+    second_sma = strategy.entry.right.left
+    assert first_sma is not second_sma
+    # Both SMA(close, 2) nodes share a single cached result
+    sma_results = [v for k, v in cache.items() if k[0] == "SMA"]
+    assert len(sma_results) == 1
+
+
+def test_numexpr_fusion_matches_numpy(monkeypatch):
+    import pytest
+    pytest.importorskip("numexpr")
+    import codegen
+
+    df = _build_small_df()
+    strategy = parse_dsl(
+        "ENTRY: (close - open) / open > 0.01 AND NOT volume < 1000000 OR close > SMA(close, 2) "
+        "EXIT: close * 2 - high <= low"
+    )
+    expected = generate_signals(strategy, df)
+    monkeypatch.setattr(codegen, "_NUMEXPR_MIN_ROWS", 0)
+    fused = generate_signals(strategy, df)
+    pd.testing.assert_frame_equal(fused, expected)
+
+
+def test_compile_ast_reusable_across_frames():
+    import numpy as np
+    from codegen import compile_ast
+
+    strategy = parse_dsl("ENTRY: close > SMA(close, 2) AND volume > 1000000 EXIT: FALSE")
+    fn = compile_ast(strategy.entry)
+
+    for df in (_build_small_df(), _build_small_df().iloc[::-1]):
+        cols = {c: df[c].to_numpy() for c in df.columns}
+        expected = generate_signals(strategy, df)["entry"].to_numpy()
+        np.testing.assert_array_equal(fn(cols), expected)
+
+
+def test_compile_ast_cached_by_structure():
+    import codegen
+
+    first = parse_dsl("ENTRY: close > SMA(close, 20) EXIT: FALSE")
+    second = parse_dsl("ENTRY: close > SMA(close, 20) EXIT: TRUE")
+    assert first.entry is not second.entry
+    assert codegen._compiled(first.entry) is codegen._compiled(second.entry)
+
+
+def test_and_or_skip_undecided_side():
+    from codegen import eval_ast
+
+    df = _build_small_df()
+    strategy = parse_dsl("ENTRY: close > 1000000 AND RSI(close, 2) < 30 EXIT: close > 0 OR EMA(close, 2) > 0")
+    cache = {}
+    entry = eval_ast(strategy.entry, df, cache)
+    exit_ = eval_ast(strategy.exit, df, cache)
+
+    assert not entry.any()
+    assert exit_.all()
+    # The cheap side already decided every bar, so no indicator was computed
+    assert not [k for k in cache if k[0] in ("RSI", "EMA")]
+
+
+def test_and_or_chains_match_pairwise_evaluation():
+    from codegen import eval_ast
+
+    df = _build_small_df()
+    strategy = parse_dsl(
+        "ENTRY: close > 105 AND volume > 1000000 AND open > 100 "
+        "EXIT: close < 104 OR volume < 1000000 OR open > 110"
+    )
+    entry = eval_ast(strategy.entry, df)
+    exit_ = eval_ast(strategy.exit, df)
+
+    expected_entry = (df["close"] > 105) & (df["volume"] > 1000000) & (df["open"] > 100)
+    expected_exit = (df["close"] < 104) | (df["volume"] < 1000000) | (df["open"] > 110)
+    assert entry.tolist() == expected_entry.tolist()
+    assert exit_.tolist() == expected_exit.tolist()
+
+
+def test_macd_lines_share_one_computation():
+    from codegen import eval_ast
+
+    df = _build_small_df()
+    strategy = parse_dsl("ENTRY: MACD(close) > MACD_SIGNAL(close, 12, 26, 9) AND MACD_HIST(close) > 0 EXIT: FALSE")
+    cache = {}
+    eval_ast(strategy.entry, df, cache)
+    assert len([k for k in cache if k[0] == "MACD*"]) == 1
+
+
+def test_lagged_comparisons_match_shifted_series():
+    df = _build_small_df()
+    strategy = parse_dsl("ENTRY: close > high[1] EXIT: close[2] != close")
+    signals = generate_signals(strategy, df)
+
+    expected_entry = (df["close"] > df["high"].shift(1)).to_numpy()
+    expected_exit = (df["close"].shift(2) != df["close"]).to_numpy()
+    assert (signals["entry"].to_numpy() == expected_entry).all()
+    assert (signals["exit"].to_numpy() == expected_exit).all()
+
+
+def test_tape_matches_evaluator():
+    import pytest
+    pytest.importorskip("numba")
+    import numpy as np
+    from codegen import Evaluator, _finalize, _run_tape
+
+    df = _build_small_df()
+    strategy = parse_dsl(
+        "ENTRY: CROSSOVER(EMA(close, 2), SMA(close, 3)) OR close[1] < open AND NOT volume > 1000000 "
+        "EXIT: RSI(close, 2) > 50 OR (high - low) / close >= 0.05"
+    )
+    entry, exit_ = _run_tape(strategy, df)
+    evaluator = Evaluator(df)
+    assert np.array_equal(entry, _finalize(evaluator.evaluate(strategy.entry), len(df)))
+    assert np.array_equal(exit_, _finalize(evaluator.evaluate(strategy.exit), len(df)))
+
+    # MACD/BB lines aren't on the tape; generate_signals falls back to the evaluator
+    assert _run_tape(parse_dsl("ENTRY: MACD(close) > 0 EXIT: FALSE"), df) is None
@@ -82,3 +82,45 @@ def test_crossover_parsing():
     assert entry.left.name == "close"
     assert isinstance(entry.right, FuncCall)
     assert entry.right.name == "SMA"
+
+
+def test_reserved_words_get_their_own_token_type():
+    from dsl_lexer_parser import tokenize
+
+    tokens = tokenize("ENTRY: not close crossover CROSSOVER(open, high) and volume EXIT: FALSE")
+    assert [t.type for t in tokens] == [
+        "ENTRY", "COLON", "NOT", "IDENT", "CROSSOVER", "CROSSOVER", "LPAREN", "IDENT",
+        "COMMA", "IDENT", "RPAREN", "AND", "IDENT", "EXIT", "COLON", "FALSE",
+    ]
+    # A reserved word used as a function name still parses as a call
+    strategy = parse_dsl("ENTRY: CROSSOVER(close, SMA(close, 3)) EXIT: close < open")
+    assert isinstance(strategy.entry, FuncCall)
+    assert strategy.entry.name == "CROSSOVER"
+
+
+def test_repeated_leaves_are_shared():
+    strategy = parse_dsl("ENTRY: close > 1 AND close[1] < close EXIT: close[1] > 1")
+    entry = strategy.entry
+    assert entry.left.left is entry.right.right
+    assert entry.right.left is strategy.exit.left
+    assert entry.left.right is strategy.exit.right
+
+
+def test_parse_dsl_caches_by_text():
+    dsl = "ENTRY: close > SMA(close, 3) EXIT: close < open"
+    parse_dsl.cache_clear()
+    first = parse_dsl(dsl)
+    assert parse_dsl(dsl) is first
+    parse_dsl.cache_clear()
+    assert parse_dsl(dsl) is not first
+    assert parse_dsl(dsl) == first
+
+
+def test_number_multiplier_is_one_token():
+    from dsl_lexer_parser import tokenize
+
+    tokens = tokenize("volume > 1.5 M")
+    assert [(t.type, t.value) for t in tokens] == [("IDENT", "VOLUME"), ("GT", ">"), ("NUMBER", "1.5M")]
+    strategy = parse_dsl("ENTRY: volume > 1.5 M EXIT: volume < 2 k")
+    assert strategy.entry.right.value == 1_500_000.0
+    assert strategy.exit.right.value == 2_000.0
@@ -1,7 +1,17 @@
 import pandas as pd
 import numpy as np
 
-from nl_dsl_strategy.src.indicators import macd, bbands, sma
+from nl_dsl_strategy.src.indicators import (
+    bbands,
+    ema,
+    ema_frame,
+    macd,
+    macd_frame,
+    rsi,
+    rsi_frame,
+    sma,
+    sma_frame,
+)
 
 
 def test_macd_basic():
@@ -23,3 +33,88 @@ def test_bbands_basic():
     mask = mid.notna()
     assert (upper[mask] > mid[mask]).all()
     assert (lower[mask] < mid[mask]).all()
+
+
+def test_sma_kernel_matches_pandas():
+    s = pd.Series([1.0, 2.5, np.nan, 4.0, 4.0, 4.0, -3.0, 7.25, 0.1, 2.0], name="close")
+    for window in (1, 3, 5):
+        expected = s.rolling(window=window, min_periods=window).mean()
+        pd.testing.assert_series_equal(sma(s, window), expected)
+    # Integer input goes through the float64 path as well
+    ints = pd.Series(np.arange(20), dtype="int64")
+    pd.testing.assert_series_equal(sma(ints, 4), ints.rolling(window=4, min_periods=4).mean())
+
+
+def test_ema_kernel_matches_pandas():
+    s = pd.Series([10.0, np.nan, 11.0, 12.5, np.nan, np.nan, 9.0, 9.0, 13.0], name="close")
+    for window in (1, 3, 5, 12):
+        expected = s.ewm(span=window, adjust=False).mean()
+        pd.testing.assert_series_equal(ema(s, window), expected)
+
+
+def test_macd_kernel_matches_pandas():
+    s = pd.Series([np.nan, 10.0, 10.5, np.nan, 11.0, 10.0, 9.5, 9.5, 12.0, 11.0, 13.0])
+    macd_line, signal_line, hist = macd(s, fast=3, slow=5, signal=2)
+    expected_line = s.ewm(span=3, adjust=False).mean() - s.ewm(span=5, adjust=False).mean()
+    expected_signal = expected_line.ewm(span=2, adjust=False).mean()
+    pd.testing.assert_series_equal(macd_line, expected_line)
+    pd.testing.assert_series_equal(signal_line, expected_signal)
+    pd.testing.assert_series_equal(hist, expected_line - expected_signal)
+
+
+def test_bbands_kernel_matches_pandas():
+    s = pd.Series([1e9, 1e9 + 1, np.nan, 3.0, np.inf, 3.0, 4.5, 2.0, 2.0, 8.0, 1.0])
+    upper, mid, lower = bbands(s, period=3, std=2.0)
+    rolling_std = s.rolling(window=3, min_periods=3).std(ddof=0)
+    expected_mid = s.rolling(window=3, min_periods=3).mean()
+    pd.testing.assert_series_equal(mid, expected_mid)
+    pd.testing.assert_series_equal(upper, expected_mid + 2.0 * rolling_std)
+    pd.testing.assert_series_equal(lower, expected_mid - 2.0 * rolling_std)
+
+
+def test_rsi_uses_wilder_smoothing():
+    close = pd.Series([44.0, 44.5, 44.0, 45.0, 45.5, 45.0, 46.0, 47.0])
+    window = 3
+    out = rsi(close, window)
+
+    # Seed with the plain average of the first `window` moves, then
+    # avg = (prev * (window - 1) + current) / window
+    deltas = np.diff(close.to_numpy())
+    gains, losses = np.clip(deltas, 0, None), np.clip(-deltas, 0, None)
+    avg_gain, avg_loss = gains[:window].mean(), losses[:window].mean()
+    expected = [np.nan] * window + [100 - 100 / (1 + avg_gain / avg_loss)]
+    for g, l in zip(gains[window:], losses[window:]):
+        avg_gain = (avg_gain * (window - 1) + g) / window
+        avg_loss = (avg_loss * (window - 1) + l) / window
+        expected.append(100 - 100 / (1 + avg_gain / avg_loss))
+    np.testing.assert_allclose(out.to_numpy(), expected, rtol=1e-12)
+
+    # Only gains: RSI saturates at 100 instead of dividing by zero
+    assert (rsi(pd.Series(np.arange(10.0)), 3).iloc[3:] == 100).all()
+
+
+def test_frame_indicators_match_per_column():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(100 + np.cumsum(rng.normal(0, 1, (120, 4)), axis=0), columns=list("abcd"))
+    df.iloc[10, 1] = np.nan
+    for col in df.columns:
+        pd.testing.assert_series_equal(sma_frame(df, 5)[col], sma(df[col], 5))
+        pd.testing.assert_series_equal(ema_frame(df, 5)[col], ema(df[col], 5))
+        pd.testing.assert_series_equal(rsi_frame(df, 14)[col], rsi(df[col], 14))
+        for got, want in zip(macd_frame(df, 3, 6, 2), macd(df[col], 3, 6, 2)):
+            pd.testing.assert_series_equal(got[col], want)
+
+
+def test_talib_backend_matches_pandas(monkeypatch):
+    import pytest
+    pytest.importorskip("talib")
+    from nl_dsl_strategy.src import indicators
+
+    s = pd.Series(100 + np.cumsum(np.sin(np.arange(60.0))), name="close")
+    monkeypatch.setattr(indicators, "_USE_TALIB", False)
+    expected_sma = indicators.sma(s, 5)
+    expected_bands = indicators.bbands(s, 10, 2.0)
+    monkeypatch.setattr(indicators, "_USE_TALIB", True)
+    pd.testing.assert_series_equal(indicators.sma(s, 5), expected_sma, rtol=1e-9)
+    for got, expected in zip(indicators.bbands(s, 10, 2.0), expected_bands):
+        pd.testing.assert_series_equal(got, expected, rtol=1e-9)
@@ -83,3 +83,13 @@ def test_percent_and_last_week():
     assert any(c.get("modifiers", {}).get("percent") == 0.25 for c in entry)
     assert any(c.get("modifiers", {}).get("lag") == 5 for c in entry)
     assert "* 1.25" in dsl
+
+
+def test_cached_results_are_independent_copies():
+    nl = "Buy when the close price is above the 20-day moving average. Exit when RSI(14) is below 30."
+    first = parse_natural_language_to_structured(nl)
+    first["entry"][0]["right"]["args"].append(99)
+    first["exit"].clear()
+    second = parse_natural_language_to_structured(nl)
+    assert second["entry"][0]["right"]["args"] == ["close", 20]
+    assert len(second["exit"]) == 1
@@ -37,3 +37,23 @@ def test_macd_and_bbands_defined_types():
     ast = parse_dsl(dsl)
     signals = generate_signals(ast, df)
     assert "entry" in signals and signals["entry"].dtype == bool
+
+
+def test_specialized_kernels_match_pandas_indicators():
+    import pytest
+    pytest.importorskip("numba")
+    from nl_dsl_strategy.src.codegen import strategy_compile
+    from nl_dsl_strategy.src.indicators import sma, ema, rsi
+
+    strategy = parse_dsl("ENTRY: SMA(close, 4) > EMA(close, 3) AND RSI(close, 5) < 70 EXIT: FALSE")
+    kernels = strategy_compile(strategy)
+    assert set(kernels) == {("SMA", 4), ("EMA", 3), ("RSI", 5)}
+
+    close = np.array([100.0, 101.5, np.nan, 99.0, 99.0, 99.0, 103.2, 102.1, 104.7, 101.0])
+    for (name, window), fn in (
+        (("SMA", 4), sma),
+        (("EMA", 3), ema),
+        (("RSI", 5), rsi),
+    ):
+        expected = fn(pd.Series(close), window).to_numpy()
+        np.testing.assert_array_equal(kernels[(name, window)](close), expected)
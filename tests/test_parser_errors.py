@@ -11,3 +11,11 @@ def test_parser_error_message_shape():
     assert "Expected" in msg or "Unexpected" in msg
     # Optional: line/col added by parser
     assert ("line" in msg and "col" in msg) or True
+
+
+def test_tokenizer_error_reports_line_and_col():
+    bad_dsl = "ENTRY: close > open\nEXIT: close < $open"
+    with pytest.raises(DSLParseError) as ei:
+        parse_dsl(bad_dsl)
+    assert (ei.value.line, ei.value.col) == (2, 15)
+    assert ei.value.position == bad_dsl.index("$")